@@ -6,9 +6,12 @@ Converts natural language instructions to TDL code using LLM
 
 import os
 import json
+import hashlib
 import logging
 import re
-from typing import Dict, Optional
+import tempfile
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import google.generativeai as genai
 from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
@@ -16,6 +19,9 @@ from .tdl_knowledge_base import TDLKnowledgeBase
 
 logger = logging.getLogger(__name__)
 
+# LLM 응답 디스크 캐시 기본 경로
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+
 
 class NL2TDLConverter:
     """
@@ -30,15 +36,19 @@ class NL2TDLConverter:
     - Standardized command format
     """
 
-    def __init__(self, api_key: str = None, model_name: str = "gemini-2.5-pro"):
+    def __init__(self, api_key: str = None, model_name: str = "gemini-2.5-pro",
+                 cache_dir: Optional[str] = DEFAULT_CACHE_DIR):
         """
         Initialize NL2TDL Converter
 
         Args:
             api_key: Google Gemini API key. If None, tries to load from config.json
             model_name: Gemini model to use
+            cache_dir: Directory for the persistent LLM response cache
+                used by convert_with_metadata(). None disables caching.
         """
         self.model_name = model_name
+        self.cache_dir = cache_dir
         self.api_key = api_key or self._load_api_key()
 
         # Configure Gemini API
@@ -241,8 +251,7 @@ Now convert the following natural language instruction to TDL code:
         logger.info(f"Input: {nl_input[:100]}...")
 
         # Build complete prompt
-        system_prompt = self._build_system_prompt()
-        full_prompt = f"{system_prompt}\n\n**User Instruction:**\n{nl_input}"
+        full_prompt = self._build_full_prompt(nl_input)
 
         try:
             # Configure safety settings
@@ -284,6 +293,11 @@ Now convert the following natural language instruction to TDL code:
             logger.error(error_msg)
             return f"// ERROR: {error_msg}"
 
+    def _build_full_prompt(self, nl_input: str) -> str:
+        """Build the complete prompt (system prompt + user instruction) sent to Gemini"""
+        system_prompt = self._build_system_prompt()
+        return f"{system_prompt}\n\n**User Instruction:**\n{nl_input}"
+
     def _clean_output(self, output: str) -> str:
         """
         Clean LLM output to extract pure TDL code
@@ -333,7 +347,7 @@ Now convert the following natural language instruction to TDL code:
 
         seoul_tz = pytz.timezone("Asia/Seoul")
 
-        tdl_code = self.convert(nl_input, temperature)
+        tdl_code, cache_hit = self._convert_cached(nl_input, temperature)
 
         metadata = {
             "generated_at": datetime.now(seoul_tz).isoformat(),
@@ -341,6 +355,7 @@ Now convert the following natural language instruction to TDL code:
             "tdl_version": "v1",
             "model": self.model_name,
             "converter": "NL2TDLConverter",
+            "cache_hit": cache_hit,
         }
 
         return {
@@ -348,6 +363,91 @@ Now convert the following natural language instruction to TDL code:
             "metadata": metadata
         }
 
+    def convert_batch(self, nl_inputs: List[str], temperature: float = 0.0,
+                      max_workers: int = 4) -> List[Dict]:
+        """
+        Convert several natural language instructions concurrently
+
+        Each instruction goes through convert_with_metadata() (including the
+        on-disk cache); uncached ones are sent to Gemini in parallel so the
+        network round-trips overlap.
+
+        Args:
+            nl_inputs: Natural language instructions
+            temperature: LLM temperature
+            max_workers: Maximum number of concurrent API requests
+
+        Returns:
+            List of convert_with_metadata() results, in input order
+        """
+        if not nl_inputs:
+            return []
+
+        logger.info(f"Converting batch of {len(nl_inputs)} instructions...")
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(nl_inputs))) as pool:
+            return list(pool.map(
+                lambda nl: self.convert_with_metadata(nl, temperature), nl_inputs
+            ))
+
+    def _cache_path(self, nl_input: str) -> str:
+        """
+        Build the on-disk cache file path for an NL instruction
+
+        Key: SHA-256 of (model_name, full prompt text), so any change to
+        _build_system_prompt() or the knowledge base invalidates old entries
+        """
+        key = hashlib.sha256(
+            f"{self.model_name}|{self._build_full_prompt(nl_input)}".encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _convert_cached(self, nl_input: str, temperature: float) -> Tuple[str, bool]:
+        """
+        convert() with a persistent on-disk cache
+
+        Only deterministic calls (temperature == 0.0) are cached, and error
+        outputs are never stored.
+
+        Returns:
+            (tdl_code, cache_hit)
+        """
+        if not self.cache_dir or temperature != 0.0:
+            return self.convert(nl_input, temperature), False
+
+        cache_path = self._cache_path(nl_input)
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    tdl_code = json.load(f)['tdl_code']
+                logger.info(f"TDL loaded from LLM cache: {cache_path}")
+                return tdl_code, True
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable LLM cache entry {cache_path}: {e}")
+
+        tdl_code = self.convert(nl_input, temperature)
+
+        if not tdl_code.startswith("// ERROR:"):
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temp file in the same directory and rename it into place,
+                # so concurrent readers (convert_batch) never see a partial entry
+                fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump({
+                            "model": self.model_name,
+                            "nl_input": nl_input,
+                            "tdl_code": tdl_code,
+                        }, f, ensure_ascii=False)
+                    os.replace(tmp_path, cache_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
+            except Exception as e:
+                logger.warning(f"Failed to write LLM cache entry: {e}")
+
+        return tdl_code, False
+
     def save_tdl(self, tdl_code: str, output_path: str):
         """
         Save TDL code to file
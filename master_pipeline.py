@@ -13,19 +13,32 @@ Master Pipeline - Complete NL2TDL2Validation Pipeline
 """
 
 import sys
-import os
+import re
+import hashlib
 import logging
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, List
+from collections import deque
+from types import MappingProxyType
+from typing import Dict, Optional, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+# JSON 직렬화: orjson(선택 의존성)이 있으면 사용, 없으면 표준 json
+try:
+    import orjson
+
+    def _json_dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+except ImportError:
+    import json
+
+    def _json_dumps_line(obj) -> bytes:
+        return (json.dumps(obj, default=str, ensure_ascii=False) + "\n").encode('utf-8')
 
 # 경로 설정
 CURRENT_DIR = Path(__file__).parent
 sys.path.insert(0, str(CURRENT_DIR))
 
-# TDL Action Parser 임포트
-from tdl_action_parser import TDLActionParser
-
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +46,103 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# TDL 파라미터 추출용 정규식 (모듈 로드 시 1회 컴파일)
+_VEL_RE = re.compile(r'velocity[:\s]+(\d+)', re.IGNORECASE)
+_ACC_RE = re.compile(r'accel(?:eration)?[:\s]+(\d+)', re.IGNORECASE)
+
+# Fallback 파싱용 키워드 (리스트 순서 = 우선순위)
+_TASK_KEYWORDS = ('pick', 'place', 'move', 'inspect')
+_TASK_DEFAULT_LOCATION = {'place': 'bin', 'move': 'home'}
+_OBJECT_KEYWORDS = ('apple', 'banana', 'milk', 'bread', 'soda', 'part')
+
+# 키워드 alternation: 텍스트를 한 번만 스캔
+# 키워드가 모두 ASCII이므로 re.ASCII로 유니코드 case folding 생략
+# (한글 주석이 섞여 있어도 encode/lower() 복사 없이 그대로 스캔)
+_TASK_RE = re.compile('|'.join(_TASK_KEYWORDS), re.IGNORECASE | re.ASCII)
+_OBJ_RE = re.compile('|'.join(_OBJECT_KEYWORDS), re.IGNORECASE | re.ASCII)
+
+# 메모리에 유지할 실행 히스토리 최대 개수 (오래된 항목부터 제거)
+HISTORY_MAXLEN = 100
+
+# 콘솔 배너 (매 호출마다 문자열을 새로 만들지 않도록 미리 생성)
+_BANNER = "=" * 80
+_RULE = "-" * 80
+
+# 로봇 선택 ID → 시뮬레이터 내부 로봇 키 (읽기 전용)
+_ROBOT_ID_MAP = MappingProxyType({
+    'panda': 'panda',
+    'kuka_iiwa14': 'kuka_iiwa14',
+    'ur5e': 'ur5e',
+    'doosan_m0609': 'doosan_m0609',
+    'doosan_m1013': 'doosan_m1013',
+    'doosan_h2515': 'doosan_h2515',
+})
+
+# TDL 파싱 결과 캐시 (파서 로직 변경 시 _PARSER_VERSION을 올려 캐시 무효화)
+_PARSER_VERSION = 1
+_PARSE_CACHE_MAXSIZE = 512
+
+
+def _tdl_cache_key(tdl_code: str, *extra) -> tuple:
+    """TDL 내용 해시 + 파서 버전 + 부가 인자로 파싱 캐시 키 생성"""
+    digest = hashlib.blake2b(tdl_code.encode('utf-8'), digest_size=16).digest()
+    return (_PARSER_VERSION, digest) + extra
+
+
+def _write_tdl_file(tdl_filepath: Path, user_nl: str, tdl_v1: str) -> None:
+    """TDL v1을 헤더와 함께 파일로 저장 (백그라운드 I/O 스레드에서 실행)"""
+    try:
+        tdl_filepath.parent.mkdir(parents=True, exist_ok=True)
+        with open(tdl_filepath, 'w', encoding='utf-8') as f:
+            f.write(f"# Generated TDL v1\n")
+            f.write(f"# Timestamp: {datetime.now().isoformat()}\n")
+            f.write(f"# User Command: {user_nl}\n")
+            f.write(f"# {'='*60}\n\n")
+            f.write(tdl_v1)
+    except Exception as e:
+        logger.warning(f"Failed to save TDL file: {e}")
+
+
+def _append_jsonl(log_path: Path, line: bytes) -> None:
+    """직렬화된 JSONL 한 줄을 로그에 추가 (백그라운드 I/O 스레드에서 실행)"""
+    try:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, 'ab') as f:
+            f.write(line)
+    except Exception as e:
+        logger.warning(f"Failed to append history log: {e}")
+
+
+def _format_plan(action_sequence: Optional[List[Dict]]) -> str:
+    """
+    액션 시퀀스를 "pick apple → place apple" 형태의 요약 문자열로 변환
+
+    결과 dict의 'plan' 필드와 결과 출력에 사용한다.
+
+    Args:
+        action_sequence: _parse_tdl()이 반환한 액션 리스트
+
+    Returns:
+        str: 계획 요약 (액션이 없으면 'N/A')
+    """
+    if not action_sequence:
+        return 'N/A'
+    return " → ".join(f"{a['action']} {a['object']}" for a in action_sequence)
+
+
+def _first_by_priority(pattern: re.Pattern, text: str, keywords: tuple) -> Optional[str]:
+    """
+    text를 pattern으로 한 번 스캔한 뒤, 등장한 키워드 중 우선순위가 가장 높은 것을 반환
+
+    Returns:
+        str: 매칭된 키워드 (소문자), 없으면 None
+    """
+    hits = {m.lower() for m in pattern.findall(text)}
+    for keyword in keywords:
+        if keyword in hits:
+            return keyword
+    return None
+
 
 class MasterPipeline:
     """
@@ -41,73 +151,152 @@ class MasterPipeline:
     자연어 명령을 받아 TDL 생성, 검증, 시뮬레이션 실행까지 전체 과정 수행
     """
 
-    def __init__(self, use_tsd: bool = True, api_key: str = None):
+    def __init__(self, use_tsd: bool = True, api_key: str = None, save_tdl: bool = True,
+                 verbose: bool = True, history_log: Optional[str] = None):
         """
         Args:
             use_tsd: Ground Truth TSD 생성 사용 여부 (기본: True)
             api_key: Gemini API 키 (선택)
+            save_tdl: 생성된 TDL v1을 TDL_generation/output/에 저장할지 여부 (기본: True)
+            verbose: 파이프라인 진행 상황 콘솔 출력 여부 (배치/평가 시 False 권장)
+            history_log: 실행 결과를 한 줄씩 추가할 JSONL 파일 경로 (선택)
         """
-        print("=" * 80)
-        print(" NL2TDL Master Pipeline - Initializing")
-        print("=" * 80)
+        self.verbose = verbose
+
+        self._say(_BANNER)
+        self._say(" NL2TDL Master Pipeline - Initializing")
+        self._say(_BANNER)
 
         self.use_tsd = use_tsd
-        self.history = []
 
-        # 0. TDL Action Parser (다중 액션 추출)
-        print("\n[0/5] Initializing TDL Action Parser...")
-        self.tdl_parser = TDLActionParser()
+        # 히스토리는 최근 HISTORY_MAXLEN개만 메모리에 유지 (tdl_v1 등 큰 문자열 누적 방지)
+        # 전체 기록이 필요하면 history_log(JSONL)에 영구 저장
+        self.history = deque(maxlen=HISTORY_MAXLEN)
+        self.history_log = Path(history_log) if history_log else None
 
-        # 1. NL2TDL Converter
-        print("[1/5] Loading NL2TDL Converter...")
-        from TDL_generation.nl2tdl_converter import NL2TDLConverter
-        self.nl2tdl = NL2TDLConverter(api_key=api_key)
+        # TDL 파싱 캐시 {(parser_version, digest, ...): 결과}
+        self._parse_cache = {}
 
-        # 2. TSD Generator (Ground Truth State Description)
-        if use_tsd:
-            print("[2/5] Loading Ground Truth TSD Generator...")
-            from TDL_generation.state_to_text_generator import StateToTextGenerator
-            self.tsd_generator = StateToTextGenerator()
-        else:
-            print("[2/5] TSD disabled (using NL only)")
-            self.tsd_generator = None
-
-        # 3. Robot Selector
-        print("[3/5] Loading Robot Selector...")
-        from robot_selection.robot_selector import select_best_robot
-        self.select_robot_func = select_best_robot
-
-        # Load robot database for dynamics profile lookup
-        import json
-        db_path = os.path.join(
-            os.path.dirname(__file__),
-            'robot_selection', 'data', 'robot_db.json'
-        )
-        with open(db_path, 'r', encoding='utf-8') as f:
-            self.robot_db = json.load(f)
+        # TDL 파일 저장은 파이프라인을 막지 않도록 단일 I/O 스레드에서 수행
+        self.save_tdl = save_tdl
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tdl-io")
 
-        # 4. Dynamics Validator
-        print("[4/5] Loading Dynamics Validator...")
-        from dynamics_validation.parameter_scaler import ParameterScaler
-        from dynamics_validation.robot_dynamics_db import load_robot
+        # 무거운 컴포넌트(NL2TDL/TSD/Parser/Robot Selector/Robot DB)는 첫 사용 시 로드 (property 참고)
+        # → /help, /history만 쓰는 경우 google.generativeai, numpy 등 임포트 비용 없음
+        self._api_key = api_key
+        self._tdl_parser = None
+        self._nl2tdl = None
+        self._tsd_generator = None
+        self._robot_db = None
+        self._select_robot_func = None
 
-        # 로봇 DB는 나중에 로봇 선택 후 로드
+        # Dynamics Validator: 로봇 선택 후 _run_dynamics()에서 로드
         self.dynamics_validator = None
 
-        # 5. Simulation Validator (PyBullet)
-        # 시뮬레이터는 로봇 선택 후 초기화
-        print("[5/5] Deferring Simulator initialization until robot selection...")
+        # Simulation Validator (PyBullet)
+        # 시뮬레이터는 로봇 선택 후 초기화 (같은 로봇이 다시 선택되면 재사용)
         self.sim_validator = None
+        self._current_robot_id: Optional[str] = None
+        self._robot_config_cache: Dict[str, Dict] = {}
+
+        # 시뮬레이터 warm-up: 첫 파이프라인 실행의 Step 1(LLM 호출) 동안 백그라운드에서
+        # pybullet/numpy/cv2 임포트와 로봇별 robot_config 생성을 미리 수행
+        # (URDF 로딩 자체는 PyBullet GUI 연결이 프로세스당 1개이므로 선택 후 수행)
+        self._warmup_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sim-warmup")
+        self._warmup_future = None
+
+        self._say("\n[OK] Master Pipeline Ready!")
+        self._say("  (Components load on first use; simulator after robot selection)")
+        self._say(_BANNER)
+
+    def _say(self, message: str = "") -> None:
+        """verbose 모드일 때만 진행 상황 출력"""
+        if self.verbose:
+            print(message)
+
+    @property
+    def tdl_parser(self):
+        """TDL Action Parser (다중 액션 추출) - 첫 사용 시 초기화"""
+        if self._tdl_parser is None:
+            self._say("\n[Lazy] Initializing TDL Action Parser...")
+            from tdl_action_parser import TDLActionParser
+            self._tdl_parser = TDLActionParser()
+        return self._tdl_parser
+
+    @property
+    def nl2tdl(self):
+        """NL2TDL Converter - 첫 사용 시 로드"""
+        if self._nl2tdl is None:
+            self._say("[Lazy] Loading NL2TDL Converter...")
+            from TDL_generation.nl2tdl_converter import NL2TDLConverter
+            self._nl2tdl = NL2TDLConverter(api_key=self._api_key)
+        return self._nl2tdl
+
+    @property
+    def tsd_generator(self):
+        """TSD Generator (Ground Truth State Description) - TSD 사용 시에만 로드"""
+        if not self.use_tsd:
+            return None
+        if self._tsd_generator is None:
+            self._say("[Lazy] Loading Ground Truth TSD Generator...")
+            from TDL_generation.state_to_text_generator import StateToTextGenerator
+            self._tsd_generator = StateToTextGenerator()
+        return self._tsd_generator
+
+    @property
+    def select_robot_func(self):
+        """Robot Selector (select_best_robot, numpy 사용) - 첫 사용 시 임포트"""
+        if self._select_robot_func is None:
+            from robot_selection.robot_selector import select_best_robot
+            self._select_robot_func = select_best_robot
+        return self._select_robot_func
+
+    @select_robot_func.setter
+    def select_robot_func(self, func):
+        self._select_robot_func = func
+
+    @property
+    def robot_db(self) -> Dict:
+        """Robot database (dynamics profile 조회용) - 첫 사용 시 로드 및 _ROBOT_ID_MAP 검증"""
+        if self._robot_db is None:
+            # 로봇 선택/시뮬레이터와 같은 캐시된 로더 공유 (경로 + 수정 시각 기준)
+            from robot_selection.robot_selector import load_robot_db
+            robot_db = load_robot_db()
+            # 시뮬레이션 가능한 로봇이 모두 내부 키 매핑을 갖는지 로드 시 1회 검증
+            self._validate_robot_id_map(robot_db)
+            self._robot_db = robot_db
+        return self._robot_db
+
+    def _start_warm_up(self) -> None:
+        """시뮬레이터 warm-up을 (아직 시작하지 않았다면) 백그라운드에서 시작"""
+        if self._warmup_future is None:
+            self._warmup_future = self._warmup_pool.submit(self._warm_up_simulator)
+
+    @staticmethod
+    def _validate_robot_id_map(robot_db: Dict) -> None:
+        """
+        robot_db에서 URDF가 있는 로봇이 모두 _ROBOT_ID_MAP에 등록되어 있는지 확인
 
-        print("\n[OK] Master Pipeline Ready!")
-        print("  (Simulator will be initialized after robot selection)")
-        print("=" * 80)
+        Raises:
+            ValueError: 매핑이 누락된 로봇이 있을 때
+        """
+        missing = [
+            robot_id for robot_id, spec in robot_db.items()
+            if spec.get('pybullet_config', {}).get('urdf_available', False)
+            and robot_id not in _ROBOT_ID_MAP
+        ]
+        if missing:
+            raise ValueError(
+                f"Robots {missing} are simulatable but have no entry in _ROBOT_ID_MAP"
+            )
 
     def execute_full_pipeline(self,
                             user_nl: str,
                             robot_requirements: Dict = None,
                             output_video: str = None,
-                            enable_dynamics: bool = True) -> Dict:
+                            enable_dynamics: bool = True,
+                            tdl_result: Optional[Dict] = None,
+                            robot_selection: Optional[Tuple[str, float, Dict]] = None) -> Dict:
         """
         전체 파이프라인 실행
 
@@ -116,13 +305,19 @@ class MasterPipeline:
             robot_requirements: 로봇 요구사항 (선택)
             output_video: 출력 비디오 경로 (기본값: auto)
             enable_dynamics: 동역학 검증 활성화 여부
+            tdl_result: 미리 생성된 convert_with_metadata() 결과 (선택, 배치 실행용)
+                주어지면 Step 1의 LLM 호출을 건너뜀
+            robot_selection: 같은 TDL에 대해 미리 계산한 select_robot_func() 결과 (선택, 배치 실행용)
+                주어지면 Step 2의 로봇 선택을 건너뜀
 
         Returns:
             dict: 전체 실행 결과
         """
-        print("\n" + "=" * 80)
-        print(f" Executing Pipeline: \"{user_nl}\"")
-        print("=" * 80)
+        self._say("\n" + _BANNER)
+        self._say(f" Executing Pipeline: \"{user_nl}\"")
+        self._say(_BANNER)
+
+        self._start_warm_up()
 
         result = {
             'user_nl': user_nl,
@@ -131,12 +326,13 @@ class MasterPipeline:
         }
 
         # Step 1: NL → TDL v1 (without TSD context initially)
-        print("\n" + "-" * 80)
-        print(" STEP 1: NL → TDL v1 Generation (Initial)")
-        print("-" * 80)
+        self._say("\n" + _RULE)
+        self._say(" STEP 1: NL → TDL v1 Generation (Initial)")
+        self._say(_RULE)
 
         try:
-            tdl_result = self.nl2tdl.convert_with_metadata(user_nl)
+            if tdl_result is None:
+                tdl_result = self.nl2tdl.convert_with_metadata(user_nl)
 
             # convert_with_metadata returns {'tdl_code': ..., 'metadata': ...}
             if 'tdl_code' not in tdl_result:
@@ -144,29 +340,22 @@ class MasterPipeline:
                 return result
 
             tdl_v1 = tdl_result['tdl_code']
-            print(f"[OK] TDL v1 generated ({len(tdl_v1)} chars)")
+            self._say(f"[OK] TDL v1 generated ({len(tdl_v1)} chars)")
             result['tdl_v1'] = tdl_v1
 
-            # TDL 파일 저장
-            try:
+            # TDL 파일 저장 (백그라운드, fire-and-forget)
+            if self.save_tdl:
                 output_dir = Path(CURRENT_DIR) / "TDL_generation" / "output"
-                output_dir.mkdir(parents=True, exist_ok=True)
-
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                tdl_filename = f"tdl_v1_{timestamp}.txt"
-                tdl_filepath = output_dir / tdl_filename
-
-                with open(tdl_filepath, 'w', encoding='utf-8') as f:
-                    f.write(f"# Generated TDL v1\n")
-                    f.write(f"# Timestamp: {datetime.now().isoformat()}\n")
-                    f.write(f"# User Command: {user_nl}\n")
-                    f.write(f"# {'='*60}\n\n")
-                    f.write(tdl_v1)
+                # 비디오 파일명이 주어지면 같은 이름(배치 인덱스 포함)을 사용해 1초 내 연속 실행 시 충돌 방지
+                if output_video is not None:
+                    run_tag = Path(output_video).stem
+                else:
+                    run_tag = datetime.now().strftime("%Y%m%d_%H%M%S")
+                tdl_filepath = output_dir / f"tdl_v1_{run_tag}.txt"
 
-                print(f"  TDL saved to: {tdl_filepath}")
+                self._io_pool.submit(_write_tdl_file, tdl_filepath, user_nl, tdl_v1)
+                self._say(f"  TDL saving to: {tdl_filepath}")
                 result['tdl_filepath'] = str(tdl_filepath)
-            except Exception as e:
-                logger.warning(f"Failed to save TDL file: {e}")
 
         except Exception as e:
             result['error'] = f"TDL generation error: {e}"
@@ -174,17 +363,19 @@ class MasterPipeline:
             return result
 
         # Step 2: Robot Selection
-        print("\n" + "-" * 80)
-        print(" STEP 2: Robot Selection")
-        print("-" * 80)
+        self._say("\n" + _RULE)
+        self._say(" STEP 2: Robot Selection")
+        self._say(_RULE)
 
         try:
             # select_best_robot returns Tuple[str, float, Dict]
-            robot_id, confidence, all_scores = self.select_robot_func(
-                tdl_v1_content=tdl_v1,
-                robot_db_path=None,
-                weights=robot_requirements if robot_requirements else None
-            )
+            if robot_selection is None:
+                robot_selection = self.select_robot_func(
+                    tdl_v1_content=tdl_v1,
+                    robot_db_path=None,
+                    weights=robot_requirements if robot_requirements else None
+                )
+            robot_id, confidence, all_scores = robot_selection
 
             # Build robot_result structure
             robot_result = {
@@ -198,9 +389,9 @@ class MasterPipeline:
             }
 
             selected_robot = robot_result['selected_robot']
-            print(f"[OK] Selected Robot: {selected_robot['name']}")
-            print(f"  Confidence: {confidence:.2f}")
-            print(f"  Reason: {robot_result['reason']}")
+            self._say(f"[OK] Selected Robot: {selected_robot['name']}")
+            self._say(f"  Confidence: {confidence:.2f}")
+            self._say(f"  Reason: {robot_result['reason']}")
             result['robot_selection'] = robot_result
 
         except Exception as e:
@@ -209,124 +400,100 @@ class MasterPipeline:
             return result
 
         # Step 3: Initialize Simulator with Selected Robot
-        print("\n" + "-" * 80)
-        print(" STEP 3: Initialize Simulator with Selected Robot")
-        print("-" * 80)
+        self._say("\n" + _RULE)
+        self._say(" STEP 3: Initialize Simulator with Selected Robot")
+        self._say(_RULE)
 
         try:
             # Build robot configuration
             robot_config = self._build_robot_config(robot_id)
-            print(f"  Robot_A: {robot_config['Robot_A']['robot_id']}")
-            print(f"  Robot_B: {robot_config['Robot_B']['robot_id']}")
+            self._say(f"  Robot_A: {robot_config['Robot_A']['robot_id']}")
+            self._say(f"  Robot_B: {robot_config['Robot_B']['robot_id']}")
 
-            # Initialize simulator
-            self._initialize_simulator(robot_config)
+            # Initialize simulator (같은 로봇이면 URDF 재로딩 없이 씬만 초기화)
+            if self.sim_validator is not None and robot_id == self._current_robot_id:
+                self._say(f"  [Reuse] Simulator already loaded with {robot_id}, resetting scene")
+                self.sim_validator.reset_scene()
+            else:
+                self._initialize_simulator(robot_config)
+                self._current_robot_id = robot_id
 
         except Exception as e:
             result['error'] = f"Simulator initialization error: {e}"
             logger.exception("Simulator initialization failed")
             return result
 
-        # Step 4: Ground Truth TSD Generation (optional, after robot selection)
+        # Step 4 & 5: TSD 생성(PyBullet 조회)과 동역학 검증(순수 계산)은 서로 독립적이므로
+        # 스레드 풀에서 동시에 실행하고, 결과 출력은 Step 순서대로 수행
         scene_context = None
-        if self.use_tsd and self.tsd_generator:
-            print("\n" + "-" * 80)
-            print(" STEP 4: Ground Truth TSD Generation")
-            print("-" * 80)
-
-            try:
-                # PyBullet scene description from initialized simulator
-                scene_context = self.sim_validator.get_scene_description()
-
-                # Store result
-                result['tsd_analysis'] = {'context': scene_context}
-                print("[OK] TSD context generated from PyBullet scene")
-                print(f"\n{scene_context}\n")
-
-            except Exception as e:
-                print(f"[X] TSD generation error: {e}")
-                logger.exception("TSD generation failed")
-                scene_context = None
-
-        # Step 5: Dynamics Validation (optional)
         tdl_v2 = None
-        if enable_dynamics:
-            print("\n" + "-" * 80)
-            print(" STEP 5: Dynamics Validation")
-            print("-" * 80)
-
-            try:
-                from dynamics_validation.parameter_scaler import ParameterScaler
-                from dynamics_validation.robot_dynamics_db import load_robot
-
-                # Get selected robot spec to access dynamics_profile
-                selected_robot_id = selected_robot['id']
-                selected_spec = self.robot_db.get(selected_robot_id)
-
-                if not selected_spec:
-                    raise ValueError(f"Robot '{selected_robot_id}' not found in database")
-
-                # Use dynamics_profile to load correct dynamics
-                dynamics_name = selected_spec.get('dynamics_profile', 'Robot_A')
-
-                print(f"[Dynamics Validation]")
-                print(f"  Selected Robot: {selected_robot_id}")
-                print(f"  Dynamics Profile: {dynamics_name}")
-
-                robot_db = load_robot(robot_name=dynamics_name)
-                print(f"  Loaded dynamics for {dynamics_name} (validating {selected_robot_id})")
-
-                # 동역학 검증
-                scaler = ParameterScaler(robot_db, safety_margin=0.9)
-
-                # TDL v1에서 파라미터 추출 (간단한 예시)
-                tdl_params = self._extract_tdl_parameters(tdl_v1)
-
-                scaling_result = scaler.scale_tdl_parameters(tdl_params)
-
-                print(f"[OK] Dynamics validation complete")
-                print(f"  Feasible: {scaling_result['feasible']}")
-                print(f"  Scale Factor: {scaling_result['scale_factor']:.3f}")
-
-                result['dynamics_validation'] = scaling_result
-                tdl_v2 = scaling_result['tdl_v2']
-
-            except Exception as e:
-                print(f"[!] Dynamics validation skipped: {e}")
-                logger.warning("Dynamics validation failed, continuing without it")
-                tdl_v2 = None
+        run_tsd = self.use_tsd and self.tsd_generator
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            tsd_future = pool.submit(self.sim_validator.get_scene_description) if run_tsd else None
+            dyn_future = pool.submit(self._run_dynamics, tdl_v1, selected_robot['id']) if enable_dynamics else None
+
+            # Step 4: Ground Truth TSD Generation (optional, after robot selection)
+            if tsd_future is not None:
+                self._say("\n" + _RULE)
+                self._say(" STEP 4: Ground Truth TSD Generation")
+                self._say(_RULE)
+
+                try:
+                    # PyBullet scene description from initialized simulator
+                    scene_context = tsd_future.result()
+
+                    # Store result
+                    result['tsd_analysis'] = {'context': scene_context}
+                    self._say("[OK] TSD context generated from PyBullet scene")
+                    self._say(f"\n{scene_context}\n")
+
+                except Exception as e:
+                    self._say(f"[X] TSD generation error: {e}")
+                    logger.exception("TSD generation failed")
+                    scene_context = None
+
+            # Step 5: Dynamics Validation (optional)
+            if dyn_future is not None:
+                self._say("\n" + _RULE)
+                self._say(" STEP 5: Dynamics Validation")
+                self._say(_RULE)
+
+                try:
+                    dynamics_name, scaling_result = dyn_future.result()
+
+                    self._say(f"[Dynamics Validation]")
+                    self._say(f"  Selected Robot: {selected_robot['id']}")
+                    self._say(f"  Dynamics Profile: {dynamics_name}")
+                    self._say(f"  Loaded dynamics for {dynamics_name} (validating {selected_robot['id']})")
+                    self._say(f"[OK] Dynamics validation complete")
+                    self._say(f"  Feasible: {scaling_result['feasible']}")
+                    self._say(f"  Scale Factor: {scaling_result['scale_factor']:.3f}")
+
+                    result['dynamics_validation'] = scaling_result
+                    tdl_v2 = scaling_result['tdl_v2']
+
+                except Exception as e:
+                    self._say(f"[!] Dynamics validation skipped: {e}")
+                    logger.warning("Dynamics validation failed, continuing without it")
+                    tdl_v2 = None
 
         # Step 6: Simulation Validation (PyBullet)
-        print("\n" + "-" * 80)
-        print(" STEP 6: Simulation Validation (PyBullet)")
-        print("-" * 80)
+        self._say("\n" + _RULE)
+        self._say(" STEP 6: Simulation Validation (PyBullet)")
+        self._say(_RULE)
 
         try:
             # Map robot selector ID to internal robot key
             # Since we loaded the selected robot into Robot_A slot, use that
-            robot_to_internal_key = {
-                'panda': 'panda',
-                'kuka_iiwa14': 'kuka_iiwa14',
-                'ur5e': 'ur5e',
-                'doosan_m0609': 'doosan_m0609',
-                'doosan_m1013': 'doosan_m1013',
-                'doosan_h2515': 'doosan_h2515',
-            }
+            internal_robot_key = _ROBOT_ID_MAP.get(robot_id, robot_id)
+            self._say(f"  Using robot: {internal_robot_key}")
 
-            internal_robot_key = robot_to_internal_key.get(robot_id, robot_id)
-            print(f"  Using robot: {internal_robot_key}")
+            # TDL v1에서 액션 시퀀스 추출 (다중 액션 지원, 비어 있으면 단일 액션 fallback)
+            action_sequence = self._parse_tdl(tdl_v1, internal_robot_key, user_nl)
 
-            # TDL v1에서 액션 시퀀스 추출 (다중 액션 지원)
-            action_sequence = self._tdl_to_action_sequence(tdl_v1, internal_robot_key)
-
-            if not action_sequence:
-                print("[WARNING] No actions extracted from TDL. Falling back to single action.")
-                tdl_dict = self._tdl_to_dict(tdl_v1, internal_robot_key, user_nl)
-                action_sequence = [tdl_dict]
-
-            # PyBullet 실행 계획 생성 (요약)
-            plan_summary = " → ".join([f"{a['action']} {a['object']}" for a in action_sequence])
-            print(f"  Generated plan: {internal_robot_key}: {plan_summary}")
+            # PyBullet 실행 계획 요약 (결과의 'plan' 필드 + verbose 출력)
+            plan_summary = _format_plan(action_sequence)
+            self._say(f"  Generated plan: {internal_robot_key}: {plan_summary}")
 
             # 비디오 파일명 생성 (실제 경로는 simulation_outputs/videos/에 자동 저장됨)
             if output_video is None:
@@ -342,21 +509,28 @@ class MasterPipeline:
             )
 
             if success:
-                print(f"\n[OK] Simulation validation SUCCESS!")
-                print(f"  Message: {message}")
-                print(f"  Video saved: {output_video}")
+                self._say(f"\n[OK] Simulation validation SUCCESS!")
+                self._say(f"  Message: {message}")
 
                 result['success'] = True
                 result['simulation'] = {
                     'success': True,
                     'message': message,
                     'plan': plan_summary,
-                    'action_sequence': action_sequence,
-                    'video_path': output_video
+                    'action_sequence': action_sequence
                 }
+
+                # 비디오 저장 실패는 검증 결과와 별개로 보고 (cv2/ffmpeg 미설치 환경 등)
+                video_error = self.sim_validator.last_video_error
+                if video_error:
+                    self._say(f"  [Warning] {video_error}")
+                    result['simulation']['video_error'] = video_error
+                else:
+                    self._say(f"  Video saved: {output_video}")
+                    result['simulation']['video_path'] = output_video
             else:
-                print(f"\n[X] Simulation validation FAILED")
-                print(f"  Error: {message}")
+                self._say(f"\n[X] Simulation validation FAILED")
+                self._say(f"  Error: {message}")
 
                 result['error'] = f"Simulation failed: {message}"
                 result['simulation'] = {
@@ -373,12 +547,87 @@ class MasterPipeline:
 
         # 히스토리 저장
         self.history.append(result)
+        if self.history_log is not None:
+            # 직렬화는 호출 스레드에서 수행 (반환된 result가 이후 수정되어도 로그에는 현재 상태가 기록됨)
+            try:
+                line = _json_dumps_line(result)
+            except Exception as e:
+                logger.warning(f"Failed to serialize history record: {e}")
+            else:
+                self._io_pool.submit(_append_jsonl, self.history_log, line)
 
         return result
 
+    def execute_batch(self,
+                      nl_commands: List[str],
+                      robot_requirements: Dict = None,
+                      enable_dynamics: bool = True) -> List[Dict]:
+        """
+        여러 자연어 명령을 배치로 실행 (평가/자동화용)
+
+        1. 모든 명령의 TDL v1을 한 번에 생성 (LLM 호출 병렬화)
+        2. 선택될 로봇별로 명령을 묶어 같은 시뮬레이터 인스턴스를 재사용
+        3. 각 명령에 대해 execute_full_pipeline() 실행
+
+        Args:
+            nl_commands: 자연어 명령 리스트
+            robot_requirements: 로봇 요구사항 (선택, 모든 명령에 공통 적용)
+            enable_dynamics: 동역학 검증 활성화 여부
+
+        Returns:
+            list: 명령별 실행 결과 (입력 순서 유지)
+        """
+        self._say("\n" + _BANNER)
+        self._say(f" Executing Batch: {len(nl_commands)} commands")
+        self._say(_BANNER)
+
+        self._start_warm_up()
+        tdl_results = self.nl2tdl.convert_batch(nl_commands)
+
+        # 로봇별 그룹화 (첫 등장 순서 유지) → 시뮬레이터 재초기화 최소화
+        # 선택 결과는 execute_full_pipeline()에 넘겨 같은 명령을 다시 선택하지 않음
+        groups: Dict[Optional[str], List[int]] = {}
+        selections: List[Optional[Tuple[str, float, Dict]]] = [None] * len(nl_commands)
+        for i, tdl_result in enumerate(tdl_results):
+            try:
+                selections[i] = self.select_robot_func(
+                    tdl_v1_content=tdl_result.get('tdl_code', ''),
+                    robot_db_path=None,
+                    weights=robot_requirements if robot_requirements else None
+                )
+                robot_id = selections[i][0]
+            except Exception as e:
+                # 파이프라인 실행 중 다시 선택을 시도하고 같은 에러를 결과로 보고함
+                logger.warning(f"Robot selection failed for batch command {i}: {e}")
+                robot_id = None
+            groups.setdefault(robot_id, []).append(i)
+
+        batch_stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        results: List[Optional[Dict]] = [None] * len(nl_commands)
+        for robot_id, indices in groups.items():
+            self._say(f"\n[Batch] Robot group '{robot_id}': {len(indices)} commands")
+            for i in indices:
+                results[i] = self.execute_full_pipeline(
+                    user_nl=nl_commands[i],
+                    robot_requirements=robot_requirements,
+                    output_video=f"batch_{batch_stamp}_{i:03d}.mp4",
+                    enable_dynamics=enable_dynamics,
+                    tdl_result=tdl_results[i],
+                    robot_selection=selections[i]
+                )
+
+        succeeded = sum(1 for r in results if r['success'])
+        # 배치 요약은 verbose 여부와 관계없이 항상 출력
+        print("\n" + _BANNER)
+        print(f" Batch complete: {succeeded}/{len(results)} succeeded")
+        print(_BANNER)
+
+        return results
+
     def _build_robot_config(self, robot_id: str) -> Dict:
         """
         Convert robot selection result to robot_config for simulator.
+        Results are cached per robot_id.
 
         Args:
             robot_id: Selected robot ID from robot selection (e.g., 'panda', 'kuka_iiwa14')
@@ -390,16 +639,13 @@ class MasterPipeline:
                     'Robot_B': {robot_db entry with pybullet_config}
                 }
         """
-        import json
+        if robot_id not in self._robot_config_cache:
+            self._robot_config_cache[robot_id] = self._build_robot_config_impl(robot_id)
+        return self._robot_config_cache[robot_id]
 
-        # Load robot database
-        db_path = os.path.join(
-            os.path.dirname(__file__),
-            'robot_selection', 'data', 'robot_db.json'
-        )
-
-        with open(db_path, 'r', encoding='utf-8') as f:
-            robot_db = json.load(f)
+    def _build_robot_config_impl(self, robot_id: str) -> Dict:
+        """_build_robot_config의 실제 구현 (캐시 미스 시 호출)"""
+        robot_db = self.robot_db
 
         # Validate selected robot has URDF
         if robot_id not in robot_db:
@@ -428,6 +674,21 @@ class MasterPipeline:
 
         return robot_config
 
+    def _warm_up_simulator(self) -> None:
+        """
+        시뮬레이터 관련 모듈 임포트 및 URDF 사용 가능 로봇의 robot_config 사전 생성
+
+        백그라운드 스레드에서 실행되며, 실패해도 Step 3에서 동일 작업을 다시 수행하므로 무시
+        """
+        try:
+            import pybullet_adapter  # noqa: F401  (pybullet, numpy, cv2, simulation_env 로드)
+
+            for robot_id, spec in self.robot_db.items():
+                if spec.get('pybullet_config', {}).get('urdf_available', False):
+                    self._build_robot_config(robot_id)
+        except Exception as e:
+            logger.debug(f"Simulator warm-up skipped: {e}")
+
     def _initialize_simulator(self, robot_config: Dict) -> None:
         """
         Initialize PyBullet simulator with selected robot configuration.
@@ -435,12 +696,46 @@ class MasterPipeline:
         Args:
             robot_config: Robot configuration from _build_robot_config()
         """
-        print("\n[*] Initializing PyBullet simulator with selected robot configuration...")
+        self._say("\n[*] Initializing PyBullet simulator with selected robot configuration...")
 
         from pybullet_adapter import PyBulletExecutor
         self.sim_validator = PyBulletExecutor(render=True, robot_config=robot_config)
 
-        print("[OK] Simulator initialized with dynamic robot configuration")
+        self._say("[OK] Simulator initialized with dynamic robot configuration")
+
+    def _run_dynamics(self, tdl_v1: str, selected_robot_id: str) -> Tuple[str, Dict]:
+        """
+        선택된 로봇의 dynamics_profile로 TDL v1 파라미터 동역학 검증 (Step 5 본체)
+
+        Step 4(TSD)와 병렬 실행되므로 결과 출력은 호출자가 담당
+
+        Args:
+            tdl_v1: TDL v1 코드
+            selected_robot_id: 로봇 선택 결과 ID
+
+        Returns:
+            (dynamics_name, scaling_result)
+        """
+        from dynamics_validation.parameter_scaler import ParameterScaler
+        from dynamics_validation.robot_dynamics_db import load_robot
+
+        # Get selected robot spec to access dynamics_profile
+        selected_spec = self.robot_db.get(selected_robot_id)
+
+        if not selected_spec:
+            raise ValueError(f"Robot '{selected_robot_id}' not found in database")
+
+        # Use dynamics_profile to load correct dynamics
+        dynamics_name = selected_spec.get('dynamics_profile', 'Robot_A')
+        robot_db = load_robot(robot_name=dynamics_name)
+
+        # 동역학 검증
+        scaler = ParameterScaler(robot_db, safety_margin=0.9)
+
+        # TDL v1에서 파라미터 추출 (간단한 예시)
+        tdl_params = self._extract_tdl_parameters(tdl_v1)
+
+        return dynamics_name, scaler.scale_tdl_parameters(tdl_params)
 
     def _extract_tdl_parameters(self, tdl_code: str) -> Dict:
         """
@@ -455,20 +750,50 @@ class MasterPipeline:
             'speed_percent': 50
         }
 
-        # TDL에서 숫자 추출 시도
-        import re
-
         # 속도/가속도 파라미터 찾기
-        velocity_match = re.search(r'velocity[:\s]+(\d+)', tdl_code, re.IGNORECASE)
+        velocity_match = _VEL_RE.search(tdl_code)
         if velocity_match:
             params['speed_percent'] = int(velocity_match.group(1))
 
-        accel_match = re.search(r'accel[eration]*[:\s]+(\d+)', tdl_code, re.IGNORECASE)
+        accel_match = _ACC_RE.search(tdl_code)
         if accel_match:
             params['accel_percent'] = int(accel_match.group(1))
 
         return params
 
+    def _parse_tdl(self, tdl_code: str, robot_name: str, user_nl: str = "") -> List[Dict]:
+        """
+        TDL 코드 → 실행할 액션 시퀀스 (Step 6 단일 진입점)
+
+        액션 파서 결과가 비어 있으면 _tdl_to_dict() 결과로 단일 액션을 합성하므로
+        반환값은 항상 비어 있지 않음. 결과는 (TDL 해시, 로봇, NL, 파서 무게→물체 매핑 버전)
+        기준으로 캐시되므로 add_object_weight_mapping() 이후에는 다시 파싱됨.
+
+        Args:
+            tdl_code: TDL 코드 (LLM 생성)
+            robot_name: 로봇 이름
+            user_nl: 원본 자연어 명령 (fallback용)
+
+        Returns:
+            액션 시퀀스 리스트: [{'action': 'pick', 'object': 'apple', 'robot': 'panda'}, ...]
+        """
+        cache_key = _tdl_cache_key(tdl_code, robot_name, user_nl, self.tdl_parser.mapping_version)
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None:
+            self._say(f"\n[TDL Parser] Cache hit: reusing {len(cached)} parsed actions")
+            return [dict(a) for a in cached]
+
+        actions = self._tdl_to_action_sequence(tdl_code, robot_name)
+
+        if not actions:
+            self._say("[WARNING] No actions extracted from TDL. Falling back to single action.")
+            fallback = self._tdl_to_dict(tdl_code, robot_name, user_nl)
+            fallback['action'] = fallback['task']
+            actions = [fallback]
+
+        self._cache_parse_result(cache_key, [dict(a) for a in actions])
+        return actions
+
     def _tdl_to_action_sequence(self, tdl_code: str, robot_name: str) -> List[Dict]:
         """
         TDL 코드에서 액션 시퀀스 추출 (다중 액션 지원)
@@ -480,7 +805,7 @@ class MasterPipeline:
         Returns:
             액션 시퀀스 리스트: [{'action': 'pick', 'object': 'apple', 'robot': 'panda'}, ...]
         """
-        print("\n[TDL Parser] Extracting action sequence from TDL...")
+        self._say("\n[TDL Parser] Extracting action sequence from TDL...")
 
         # TDL 파서로 액션 추출
         actions = self.tdl_parser.parse_tdl_to_actions(tdl_code)
@@ -491,7 +816,7 @@ class MasterPipeline:
             action['speed'] = 50  # 기본 속도
 
         action_summary = [f"{a['action']} {a['object']}" for a in actions]
-        print(f"[TDL Parser] Extracted {len(actions)} actions: {action_summary}")
+        self._say(f"[TDL Parser] Extracted {len(actions)} actions: {action_summary}")
 
         return actions
 
@@ -507,8 +832,6 @@ class MasterPipeline:
         Returns:
             TDL 딕셔너리
         """
-        import re
-
         # 기본 TDL 딕셔너리
         tdl_dict = {
             'task': 'pick',
@@ -518,54 +841,49 @@ class MasterPipeline:
         }
 
         # TDL 코드에서 정보 추출
-        # Pick, Place, Move 등 찾기
-        search_text = tdl_code.lower()
-        if 'pick' in search_text:
-            tdl_dict['task'] = 'pick'
-        elif 'place' in search_text:
-            tdl_dict['task'] = 'place'
-            tdl_dict['location'] = 'bin'  # 기본값
-        elif 'move' in search_text:
-            tdl_dict['task'] = 'move'
-            tdl_dict['location'] = 'home'
-        elif 'inspect' in search_text:
-            tdl_dict['task'] = 'inspect'
+        # Pick, Place, Move 등 찾기 (한 번의 스캔 후 우선순위 적용)
+        task = _first_by_priority(_TASK_RE, tdl_code, _TASK_KEYWORDS)
+        if task:
+            tdl_dict['task'] = task
+            if task in _TASK_DEFAULT_LOCATION:
+                tdl_dict['location'] = _TASK_DEFAULT_LOCATION[task]  # 기본값
 
         # 물체 이름 추출 - 우선순위:
         # 1. TDL 코드에서 찾기
         # 2. 원본 NL에서 찾기 (TDL 생성 실패 시)
         # 3. TSD context에서 찾기 (환경에 있는 물체)
-        objects = ['apple', 'banana', 'milk', 'bread', 'soda', 'part']
 
         # 1. TDL 코드에서 찾기
-        found = False
-        for obj in objects:
-            if obj in search_text:
-                tdl_dict['object'] = obj
-                found = True
-                break
+        obj = _first_by_priority(_OBJ_RE, tdl_code, _OBJECT_KEYWORDS)
+        found = obj is not None
+        if found:
+            tdl_dict['object'] = obj
 
         # 2. TDL에서 못 찾았으면 원본 NL에서 찾기
         if not found and user_nl:
-            nl_lower = user_nl.lower()
-            for obj in objects:
-                if obj in nl_lower:
-                    tdl_dict['object'] = obj
-                    print(f"  [Fallback] Object '{obj}' extracted from NL command")
-                    found = True
-                    break
+            obj = _first_by_priority(_OBJ_RE, user_nl, _OBJECT_KEYWORDS)
+            if obj is not None:
+                tdl_dict['object'] = obj
+                self._say(f"  [Fallback] Object '{obj}' extracted from NL command")
+                found = True
 
         # 3. 여전히 못 찾았으면 경고 출력
         if not found:
-            print(f"  [WARNING] No object found in TDL or NL. Using default: {tdl_dict['object']}")
+            self._say(f"  [WARNING] No object found in TDL or NL. Using default: {tdl_dict['object']}")
 
         return tdl_dict
 
+    def _cache_parse_result(self, key: tuple, value) -> None:
+        """파싱 결과 저장 (최대 크기 초과 시 가장 오래된 항목 제거)"""
+        if len(self._parse_cache) >= _PARSE_CACHE_MAXSIZE:
+            self._parse_cache.pop(next(iter(self._parse_cache)))
+        self._parse_cache[key] = value
+
     def run_interactive(self):
         """대화형 모드 실행"""
-        print("\n" + "=" * 80)
+        print("\n" + _BANNER)
         print(" Interactive Mode - Master Pipeline")
-        print("=" * 80)
+        print(_BANNER)
         print("\nCommands:")
         print("  /help     - Show help")
         print("  /tsd      - Toggle TSD (Ground Truth State) on/off")
@@ -573,7 +891,7 @@ class MasterPipeline:
         print("  /history  - Show execution history")
         print("  /quit     - Exit")
         print("\nOr enter natural language command:")
-        print("=" * 80)
+        print(_BANNER)
 
         enable_dynamics = True
 
@@ -609,19 +927,19 @@ class MasterPipeline:
                         enable_dynamics=enable_dynamics
                     )
 
-                    print("\n" + "=" * 80)
+                    print("\n" + _BANNER)
                     if result['success']:
                         print(" [OK] PIPELINE SUCCESS!")
-                        print("=" * 80)
+                        print(_BANNER)
                         print(f"\n  Message: {result['simulation'].get('message', 'Success')}")
-                        print(f"  Plan: {result['simulation'].get('plan', 'N/A')}")
+                        print(f"  Plan: {_format_plan(result['simulation'].get('action_sequence'))}")
                         if 'video_path' in result['simulation']:
                             print(f"  Video: {result['simulation']['video_path']}")
                     else:
                         print(" [X] PIPELINE FAILED")
-                        print("=" * 80)
+                        print(_BANNER)
                         print(f"\n  Error: {result.get('error', 'Unknown error')}")
-                    print("=" * 80)
+                    print(_BANNER)
 
             except KeyboardInterrupt:
                 print("\n\nInterrupted. Exiting...")
@@ -632,9 +950,9 @@ class MasterPipeline:
 
     def _print_help(self):
         """도움말 출력"""
-        print("\n" + "-" * 80)
+        print("\n" + _RULE)
         print(" Help - Master Pipeline Commands")
-        print("-" * 80)
+        print(_RULE)
         print("\nPipeline Steps:")
         print("  1. Ground Truth TSD (optional) - MuJoCo Observation → Text State")
         print("  2. NL → TDL v1 - Generate task description (with TSD context)")
@@ -645,7 +963,7 @@ class MasterPipeline:
         print('  "Pick the apple and place it in the bin"')
         print('  "Move the banana to the left side"')
         print('  "Inspect the milk container"')
-        print("-" * 80)
+        print(_RULE)
 
     def _print_history(self):
         """실행 히스토리 출력"""
@@ -653,21 +971,21 @@ class MasterPipeline:
             print("\nNo execution history yet.")
             return
 
-        print("\n" + "-" * 80)
+        print("\n" + _RULE)
         print(f" Execution History ({len(self.history)} items)")
-        print("-" * 80)
+        print(_RULE)
 
         for i, item in enumerate(self.history, 1):
             status = "[OK]" if item['success'] else "[X]"
             print(f"\n{i}. {status} {item['user_nl']}")
             print(f"   Time: {item['timestamp']}")
             if item['success']:
-                print(f"   Plan: {item['simulation'].get('plan', 'N/A')}")
+                print(f"   Plan: {_format_plan(item['simulation'].get('action_sequence'))}")
                 print(f"   Message: {item['simulation'].get('message', 'Success')}")
             else:
                 print(f"   Error: {item.get('error', 'Unknown')}")
 
-        print("-" * 80)
+        print(_RULE)
 
 
 if __name__ == '__main__':
@@ -677,7 +995,11 @@ if __name__ == '__main__':
     parser.add_argument('--tsd', action='store_true', default=True, help='Enable Ground Truth TSD generation (default: True)')
     parser.add_argument('--no-tsd', action='store_true', help='Disable Ground Truth TSD generation')
     parser.add_argument('--command', type=str, help='Execute single command')
+    parser.add_argument('--batch', type=str, help='Execute commands from a text file (one per line)')
     parser.add_argument('--no-dynamics', action='store_true', help='Disable dynamics validation')
+    parser.add_argument('--history-log', type=str, help='Append each pipeline result to this JSONL file')
+    parser.add_argument('--quiet', action='store_true', help='Suppress per-step pipeline output')
+    parser.add_argument('--no-save-tdl', action='store_true', help='Do not write generated TDL v1 to TDL_generation/output/')
 
     args = parser.parse_args()
 
@@ -686,9 +1008,25 @@ if __name__ == '__main__':
         use_tsd = not args.no_tsd
 
         # 파이프라인 초기화
-        pipeline = MasterPipeline(use_tsd=use_tsd)
+        pipeline = MasterPipeline(
+            use_tsd=use_tsd,
+            save_tdl=not args.no_save_tdl,
+            verbose=not (args.quiet or args.batch),  # 배치 실행은 요약만 출력
+            history_log=args.history_log
+        )
+
+        if args.batch:
+            # 배치 실행
+            with open(args.batch, 'r', encoding='utf-8') as f:
+                commands = [line.strip() for line in f if line.strip()]
+
+            results = pipeline.execute_batch(
+                commands,
+                enable_dynamics=not args.no_dynamics
+            )
+            sys.exit(0 if all(r['success'] for r in results) else 1)
 
-        if args.command:
+        elif args.command:
             # 단일 명령 실행
             result = pipeline.execute_full_pipeline(
                 user_nl=args.command,
@@ -697,7 +1035,7 @@ if __name__ == '__main__':
 
             if result['success']:
                 print(f"\n[OK] SUCCESS")
-                print(f"Plan: {result['simulation'].get('plan', 'N/A')}")
+                print(f"Plan: {_format_plan(result['simulation'].get('action_sequence'))}")
                 print(f"Message: {result['simulation'].get('message', 'Success')}")
                 if 'video_path' in result['simulation']:
                     print(f"Video: {result['simulation']['video_path']}")
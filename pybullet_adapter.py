@@ -7,13 +7,95 @@ INTEGRATION_PLAN Phase 2 구현:
 - PyBullet 모터 제어 루프
 - Magic Grasp (Fixed Constraint)
 """
+import os
+import re
+import math
 import time
+import queue
+import shutil
+import threading
+import subprocess
+from datetime import datetime
+from functools import lru_cache
 import numpy as np
 import pybullet as p
 
+# OpenCV는 ffmpeg가 없을 때의 비디오 인코딩 fallback 용도 (선택 의존성)
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
 # 사용자님이 만드신 환경 임포트
 from simulation_env import MultiRobotEnv
 
+# 비디오 녹화 설정
+VIDEO_OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "simulation_outputs", "videos")
+VIDEO_WIDTH, VIDEO_HEIGHT = 1024, 768  # H.264 호환 (짝수 해상도)
+VIDEO_FPS = 30
+VIDEO_QUEUE_SIZE = 32  # writer 스레드 대기 프레임 수 (1024x768 RGBA 기준 약 100MB)
+VIDEO_DROP_WHEN_FULL = False  # drop_frames_when_full 기본값 (True: 인코더가 밀리면 프레임을 버리고 시뮬레이션 진행)
+FFMPEG_BIN = shutil.which("ffmpeg")  # 있으면 raw 프레임을 ffmpeg로 스트리밍 (H.264), 없으면 OpenCV
+
+# H.264 인코더 인자 (ffmpeg 파이프용)
+_X264_ARGS = ["-c:v", "libx264", "-preset", "ultrafast"]
+_NVENC_ARGS = ["-c:v", "h264_nvenc", "-preset", "p1"]  # NVIDIA GPU 하드웨어 인코더
+
+
+@lru_cache(maxsize=1)
+def _h264_encoder_args():
+    """
+    사용할 H.264 인코더 인자 반환 (프로세스당 1회 탐지)
+
+    NVIDIA GPU(nvidia-smi)가 있고 h264_nvenc로 1프레임 시험 인코딩이 성공하면 NVENC,
+    아니면 CPU libx264 사용. (-encoders 목록에 있어도 드라이버/세션 제한으로
+    실제 인코딩이 실패할 수 있으므로 직접 인코딩해 확인)
+    """
+    if FFMPEG_BIN and shutil.which("nvidia-smi"):
+        try:
+            probe = subprocess.run(
+                [FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
+                 "-f", "lavfi", "-i", "nullsrc=s=256x256:d=0.1", "-frames:v", "1",
+                 *_NVENC_ARGS, "-f", "null", "-"],
+                capture_output=True, timeout=10
+            )
+            if probe.returncode == 0:
+                return _NVENC_ARGS
+        except (OSError, subprocess.SubprocessError):
+            pass
+    return _X264_ARGS
+
+
+# Ground Truth TSD 템플릿 (레코드당 format 1회)
+_TSD_HEADER = "## Current Scene State\n\n### Robots"
+_TSD_ROBOT_TMPL = "- **{}**\n  - End-Effector Position: ({:.3f}, {:.3f}, {:.3f})"
+_TSD_OBJECTS_HEADER = "\n### Objects on Table"
+_TSD_OBJECT_TMPL = "- **{}**: ({:.3f}, {:.3f}, {:.3f})"
+_TSD_FOOTER = (
+    "\n### Scene Context\n"
+    "This is the current state of the simulation environment. \n"
+    "Use this information to generate appropriate task descriptions."
+)
+
+# 로봇 이름 매핑 (master_pipeline의 internal_robot_key → pybullet robot_id)
+_ROBOT_MAP = {
+    'panda': 'panda',
+    'ur5e': 'kuka',  # UR5e는 KUKA로 매핑
+    'kuka_iiwa14': 'kuka',
+    'doosan_m0609': 'panda',  # Fallback
+    'doosan_m1013': 'panda',
+    'doosan_h2515': 'panda'
+}
+
+# 모션 제어 루프 설정
+SIM_TIME_STEP = 1. / 240.    # PyBullet 기본 timestep (GUI 실시간 표시용 sleep 간격)
+REALTIME_MAX_LAG = 0.1       # GUI 실시간 재생이 이보다 더 뒤처지면 (s) 따라잡지 않고 기준 시각 재설정
+CONTROL_CHECK_INTERVAL = 5   # EE 오차 확인 + 프레임 캡처 주기 (스텝)
+STUCK_STEPS = 200            # 오차가 이 스텝 수 동안 개선되지 않으면 stuck 판정
+VIA_POINT_THRESHOLD = 0.05   # 중간 경유점(hover) 통과 판정 오차 (m) - 정밀 수렴 불필요
+IK_MAX_ITERS_COLD = 200      # 첫 IK (이전 해 없음)
+IK_MAX_ITERS_WARM = 50       # 이전 IK 해를 restPoses로 사용하는 연속 waypoint
+
 class PyBulletExecutor:
     """
     LLM이 생성한 High-level Plan(예: 'pick(apple)')을
@@ -21,7 +103,9 @@ class PyBulletExecutor:
 
     Phase 2: Real Physics Control 구현됨
     """
-    def __init__(self, render=True, robot_config=None):
+    def __init__(self, render=True, robot_config=None,
+                 video_resolution=(VIDEO_WIDTH, VIDEO_HEIGHT), capture_every_n=1,
+                 drop_frames_when_full=VIDEO_DROP_WHEN_FULL):
         """
         Initialize PyBullet executor.
 
@@ -29,7 +113,19 @@ class PyBulletExecutor:
             render (bool): GUI mode
             robot_config (dict): Robot configuration to pass to MultiRobotEnv
                 If None, uses default (KUKA + Panda)
+            video_resolution (tuple): 녹화 해상도 (width, height), H.264용 짝수만 허용
+                학습/대량 평가에는 (640, 480) 권장 (캡처·인코딩 대역폭 약 2.5배 감소)
+            capture_every_n (int): capture_frame() 호출 n번 중 1번만 녹화
+                (재생 속도 유지를 위해 인코딩 FPS도 VIDEO_FPS / n으로 낮춤)
+            drop_frames_when_full (bool): 인코더가 밀려 프레임 큐가 가득 차면 대기 대신 프레임을 버림
+                (실시간 우선, 녹화 영상에 끊김 발생 가능)
         """
+        width, height = video_resolution
+        if width % 2 or height % 2:
+            raise ValueError(f"video_resolution must be even for H.264, got {width}x{height}")
+        if capture_every_n < 1:
+            raise ValueError(f"capture_every_n must be >= 1, got {capture_every_n}")
+
         # 1. Store config
         self.robot_config = robot_config
 
@@ -37,25 +133,79 @@ class PyBulletExecutor:
         self.env = MultiRobotEnv(gui=render, robot_config=robot_config)
         self.robot_ids = self.env.robot_ids
         self.object_map = self._build_object_name_map()
+        self._obj_regex, self._obj_alias_map = self._build_object_matcher()
 
         # 3. Extract EE link indices from metadata
         self.ee_link_indices = self._extract_ee_links()
 
         # 4. Store robot metadata for IK
         self.robot_metadata = self.env.robot_metadata
+        # move_to_pose에서 매번 metadata dict를 따라가지 않도록 로봇별 IK 인자/조인트 수 미리 준비
+        self._ik_kwargs, self._controllable_joints = self._build_ik_tables()
+        self._down_orn = p.getQuaternionFromEuler([np.pi, 0, 0])  # downward grasp
 
         # 5. Grasp Constraint 저장용
         self.active_constraints = {}  # {robot_name: constraint_id}
 
+        # IK warm-start: 로봇별 마지막 IK 해 (hover → grasp → lift처럼 가까운 waypoint에 재사용)
+        self._last_ik = {}  # {robot_name: joint_poses}
+
         # 6. 비디오 녹화 관련
         self.is_recording = False
         self.video_log_id = None
-        self.video_frames = []  # 프레임 버퍼
         self.video_output_path = None
+        self._video_queue = None        # 캡처 → writer 스레드 프레임 큐
+        self._video_thread = None       # 백그라운드 인코딩 스레드
+        self._video_frame_count = 0
+        self._video_dropped = 0
+        self._video_writer_error = None
+        self.last_video_error = None    # 마지막 execute_*의 비디오 저장 실패 사유 (성공 시 None)
+        self._video_dir_ready = False   # VIDEO_OUTPUT_DIR 생성 여부 (첫 녹화 때 1회만 makedirs)
+
+        # 녹화 카메라는 고정이므로 view/projection 행렬을 한 번만 계산
+        self._cam_w, self._cam_h = width, height
+        self._capture_every_n = capture_every_n
+        self._drop_frames_when_full = drop_frames_when_full
+        self._capture_calls = 0
+        self._view_matrix = p.computeViewMatrixFromYawPitchRoll(
+            cameraTargetPosition=[0, 0, 0.5],
+            distance=2.5,
+            yaw=45,
+            pitch=-30,
+            roll=0,
+            upAxisIndex=2
+        )
+        self._proj_matrix = p.computeProjectionMatrixFOV(
+            fov=60,
+            aspect=self._cam_w / self._cam_h,
+            nearVal=0.1,
+            farVal=100.0
+        )
+        # GUI가 있으면 OpenGL 렌더러, headless(DIRECT)에서는 GL 컨텍스트/readback 없는 CPU TinyRenderer
+        self._renderer = p.ER_BULLET_HARDWARE_OPENGL if self.env.gui else p.ER_TINY_RENDERER
 
         print("\n[Adapter] PyBullet Environment Connected.")
         print(f"[Adapter] Robots: {list(self.robot_ids.keys())}")
 
+    def reset_scene(self):
+        """
+        시뮬레이터를 재생성하지 않고 초기 씬 상태로 복원 (같은 로봇으로 연속 실행 시 사용)
+
+        - 활성 grasp constraint 제거
+        - 진행 중인 녹화 정리
+        - 로봇 home pose / 물체 초기 위치 복원
+        """
+        for constraint_id in self.active_constraints.values():
+            p.removeConstraint(constraint_id)
+        self.active_constraints = {}
+        self._last_ik = {}  # home pose로 돌아가므로 이전 IK 해는 무효
+
+        if self.is_recording:
+            self.stop_video_recording()
+
+        self.env.restore_initial_state()
+        print("[Adapter] Scene reset (simulator reused)")
+
     def get_scene_description(self):
         """
         PyBullet 환경에서 Ground Truth TSD 생성
@@ -63,31 +213,46 @@ class PyBulletExecutor:
         Returns:
             str: 마크다운 형식의 현재 씬 상태 설명
         """
-        tsd_lines = ["## Current Scene State\n"]
+        tsd_lines = [_TSD_HEADER]
 
         # 1. 로봇 상태
-        tsd_lines.append("### Robots")
         for robot_name, robot_id in self.robot_ids.items():
-            ee_link = self.ee_link_indices[robot_name]
-            ee_state = p.getLinkState(robot_id, ee_link)
-            ee_pos = ee_state[0]
-
+            ee_pos = p.getLinkState(robot_id, self.ee_link_indices[robot_name])[0]
             display_name = "Robot_A (KUKA)" if robot_name == "kuka" else "Robot_B (Panda)"
-            tsd_lines.append(f"- **{display_name}**")
-            tsd_lines.append(f"  - End-Effector Position: ({ee_pos[0]:.3f}, {ee_pos[1]:.3f}, {ee_pos[2]:.3f})")
+            tsd_lines.append(_TSD_ROBOT_TMPL.format(display_name, *ee_pos))
 
         # 2. 물체 상태
-        tsd_lines.append("\n### Objects on Table")
+        tsd_lines.append(_TSD_OBJECTS_HEADER)
         for obj_name, obj_id in self.object_map.items():
-            pos, orn = p.getBasePositionAndOrientation(obj_id)
-            tsd_lines.append(f"- **{obj_name}**: ({pos[0]:.3f}, {pos[1]:.3f}, {pos[2]:.3f})")
+            pos = p.getBasePositionAndOrientation(obj_id)[0]
+            tsd_lines.append(_TSD_OBJECT_TMPL.format(obj_name, *pos))
 
-        tsd_lines.append("\n### Scene Context")
-        tsd_lines.append("This is the current state of the simulation environment. ")
-        tsd_lines.append("Use this information to generate appropriate task descriptions.")
+        tsd_lines.append(_TSD_FOOTER)
 
         return "\n".join(tsd_lines)
 
+    def _resolve_video_path(self, video_path=None):
+        """
+        녹화 파일 경로를 VIDEO_OUTPUT_DIR 아래로 결정 (디렉토리는 최초 1회만 생성)
+
+        Args:
+            video_path: 사용자 지정 경로 (파일명만 사용), None이면 타임스탬프로 생성
+
+        Returns:
+            str: simulation_outputs/videos/ 아래의 비디오 경로
+        """
+        if not self._video_dir_ready:
+            os.makedirs(VIDEO_OUTPUT_DIR, exist_ok=True)
+            self._video_dir_ready = True
+
+        if video_path is None:
+            # 타임스탬프로 파일명 생성
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            return os.path.join(VIDEO_OUTPUT_DIR, f"simulation_{timestamp}.mp4")
+
+        # 사용자가 경로를 지정한 경우에도 simulation_outputs/videos/ 폴더로 저장 (파일명만 추출)
+        return os.path.join(VIDEO_OUTPUT_DIR, os.path.basename(video_path))
+
     def start_video_recording(self, output_path="simulation_video.mp4", use_frame_capture=True):
         """
         비디오 녹화 시작
@@ -108,7 +273,20 @@ class PyBulletExecutor:
 
         if use_frame_capture:
             # 프레임 캡처 방식 (안정적)
-            self.video_frames = []
+            # 캡처된 프레임은 bounded queue를 통해 writer 스레드가 즉시 인코딩
+            # (큐가 가득 차면 시뮬레이션 쪽이 대기 → 프레임 손실 없음,
+            #  drop_frames_when_full=True면 대기 대신 프레임을 버림)
+            self._video_queue = queue.Queue(maxsize=VIDEO_QUEUE_SIZE)
+            self._video_frame_count = 0
+            self._video_dropped = 0
+            self._capture_calls = 0
+            self._video_thread = threading.Thread(
+                target=self._video_writer_loop,
+                args=(self._video_queue, output_path, VIDEO_FPS / self._capture_every_n),
+                name="video-writer",
+                daemon=True
+            )
+            self._video_thread.start()
             print(f"[Video] Frame capture recording started: {output_path}")
             print(f"[Video] Using stable frame-by-frame capture method")
             return True
@@ -129,43 +307,41 @@ class PyBulletExecutor:
 
     def capture_frame(self):
         """
-        현재 프레임을 캡처하여 버퍼에 저장 (녹화 중일 때만)
+        현재 프레임을 캡처하여 writer 큐에 전달 (녹화 중일 때만)
         """
-        if not self.is_recording or self.video_frames is None:
+        if not self.is_recording or self._video_queue is None:
             return
 
-        try:
-            # PyBullet 카메라로 이미지 캡처
-            width, height = 1024, 768
-            view_matrix = p.computeViewMatrixFromYawPitchRoll(
-                cameraTargetPosition=[0, 0, 0.5],
-                distance=2.5,
-                yaw=45,
-                pitch=-30,
-                roll=0,
-                upAxisIndex=2
-            )
-            proj_matrix = p.computeProjectionMatrixFOV(
-                fov=60,
-                aspect=width / height,
-                nearVal=0.1,
-                farVal=100.0
-            )
+        # 서브샘플링: n번째 호출마다 1프레임만 렌더링
+        self._capture_calls += 1
+        if (self._capture_calls - 1) % self._capture_every_n:
+            return
 
+        try:
+            # PyBullet 카메라로 이미지 캡처 (행렬은 __init__에서 미리 계산)
+            width, height = self._cam_w, self._cam_h
             (_, _, px, _, _) = p.getCameraImage(
                 width=width,
                 height=height,
-                viewMatrix=view_matrix,
-                projectionMatrix=proj_matrix,
-                renderer=p.ER_BULLET_HARDWARE_OPENGL
+                viewMatrix=self._view_matrix,
+                projectionMatrix=self._proj_matrix,
+                renderer=self._renderer,
+                flags=p.ER_NO_SEGMENTATION_MASK  # 세그멘테이션 마스크 계산 생략
             )
 
-            # RGB 이미지만 추출 (alpha 채널 제거)
-            import numpy as np
-            rgb_array = np.array(px, dtype=np.uint8)
-            rgb_array = rgb_array[:, :, :3]  # RGBA -> RGB
+            # RGBA 그대로 전달 (alpha 슬라이싱 복사 없음, 채널 변환은 인코더 쪽에서 수행)
+            # PyBullet이 NumPy 배열을 반환하면 asarray는 복사하지 않음
+            rgba_array = np.asarray(px, dtype=np.uint8).reshape(height, width, 4)
 
-            self.video_frames.append(rgb_array)
+            if self._drop_frames_when_full:
+                try:
+                    self._video_queue.put_nowait(rgba_array)
+                except queue.Full:
+                    self._video_dropped += 1
+                    return
+            else:
+                self._video_queue.put(rgba_array)  # 큐가 가득 차면 대기 (back-pressure)
+            self._video_frame_count += 1
         except Exception as e:
             print(f"[Warning] Frame capture failed: {e}")
 
@@ -180,19 +356,26 @@ class PyBulletExecutor:
             print("[Warning] No active recording to stop")
             return False
 
-        # 프레임 캡처 방식
-        if self.video_frames:
-            try:
-                print(f"[Video] Saving {len(self.video_frames)} frames to {self.video_output_path}")
-                self._save_frames_to_video()
-                self.video_frames = []
-                self.is_recording = False
-                print("[Video] Recording saved successfully")
-                return True
-            except Exception as e:
-                print(f"[Error] Failed to save video: {e}")
-                self.is_recording = False
+        # 프레임 캡처 방식: writer 스레드에 종료 신호 후 남은 프레임 인코딩 대기
+        if self._video_thread is not None:
+            print(f"[Video] Finalizing {self._video_frame_count} frames to {self.video_output_path}")
+            self._video_queue.put(None)
+            self._video_thread.join()
+            self._video_thread = None
+            self._video_queue = None
+            self.is_recording = False
+
+            if self._video_writer_error:
+                print(f"[Error] Failed to save video: {self._video_writer_error}")
+                self._video_writer_error = None
                 return False
+            if self._video_dropped:
+                print(f"[Warning] Dropped {self._video_dropped} frames (encoder could not keep up)")
+            if self._video_frame_count == 0:
+                print("[Warning] No frames to save")
+                return False
+            print("[Video] Recording saved successfully")
+            return True
 
         # PyBullet 내장 방식
         elif self.video_log_id is not None:
@@ -208,44 +391,108 @@ class PyBulletExecutor:
 
         return False
 
-    def _save_frames_to_video(self):
+    def _finish_video_recording(self, video_path):
         """
-        캡처된 프레임들을 MP4 파일로 저장
+        녹화를 중지하고, 저장에 실패하면 last_video_error에 사유를 기록
+        (cv2/ffmpeg는 선택 의존성이므로 비디오 실패가 시뮬레이션 결과를 바꾸지 않음)
+
+        Returns:
+            bool: 비디오 저장 성공 여부
         """
-        try:
-            import cv2
-            import numpy as np
+        if self.stop_video_recording():
+            return True
+        self.last_video_error = f"Video recording failed: {video_path}"
+        print(f"[Warning] {self.last_video_error}")
+        return False
 
-            if not self.video_frames:
-                print("[Warning] No frames to save")
-                return
-
-            # 비디오 설정
-            height, width = self.video_frames[0].shape[:2]
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            fps = 30  # 30 FPS
-
-            out = cv2.VideoWriter(
-                self.video_output_path,
-                fourcc,
-                fps,
-                (width, height)
-            )
+    def _video_writer_loop(self, frame_queue, output_path, fps):
+        """
+        Writer 스레드: 큐에서 프레임을 꺼내 MP4 파일로 인코딩
 
-            # 프레임 쓰기
-            for frame in self.video_frames:
-                # RGB -> BGR (OpenCV 형식)
-                bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                out.write(bgr_frame)
+        프레임은 (H, W, 4) RGBA 배열.
+        ffmpeg가 설치되어 있으면 raw rgba 프레임을 stdin 파이프로 스트리밍(libx264),
+        없으면 OpenCV VideoWriter(mp4v)로 fallback.
 
-            out.release()
-            print(f"[Video] Saved {len(self.video_frames)} frames at {fps} FPS")
+        종료 신호(None)를 받을 때까지 실행되며, 에러가 나도 큐는 끝까지 비워서
+        캡처 쪽이 put()에서 멈추지 않도록 함.
+        """
+        ffmpeg = None   # ffmpeg subprocess (우선)
+        writer = None   # cv2.VideoWriter (fallback)
+        bgr = None      # fallback용 BGR 변환 버퍼 (프레임마다 재사용)
+        written = 0
+        finished = False
+        try:
+            while True:
+                frame = frame_queue.get()
+                if frame is None:
+                    finished = True
+                    break
+
+                if ffmpeg is None and writer is None:
+                    height, width = frame.shape[:2]
+                    if FFMPEG_BIN:
+                        ffmpeg = self._open_ffmpeg_pipe(output_path, width, height, fps)
+                    else:
+                        if cv2 is None:
+                            raise ImportError("cv2")
+                        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+                        writer = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+                        bgr = np.empty((height, width, 3), dtype=np.uint8)
+
+                if ffmpeg is not None:
+                    # 연속 배열의 버퍼를 그대로 전달 (tobytes()의 프레임당 3MB 할당/복사 없음)
+                    ffmpeg.stdin.write(np.ascontiguousarray(frame).data)
+                else:
+                    # RGBA -> BGR (OpenCV 형식, 변환 1회로 alpha 제거 포함, 결과는 bgr 버퍼에 덮어씀)
+                    writer.write(cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR, dst=bgr))
+                written += 1
 
         except ImportError:
-            print("[Error] OpenCV (cv2) not installed. Cannot save video.")
-            print("[Info] Install: pip install opencv-python")
+            self._video_writer_error = "OpenCV (cv2) not installed. Install: pip install opencv-python (or FFmpeg, see INSTALL_FFMPEG.md)"
         except Exception as e:
-            print(f"[Error] Video save failed: {e}")
+            self._video_writer_error = f"Video save failed: {e}"
+        finally:
+            if ffmpeg is not None:
+                try:
+                    ffmpeg.stdin.close()
+                except OSError:
+                    pass
+                if ffmpeg.wait() != 0 and self._video_writer_error is None:
+                    self._video_writer_error = f"ffmpeg exited with code {ffmpeg.returncode}"
+            if writer is not None:
+                writer.release()
+            if not finished:
+                # 남은 프레임 폐기 (종료 신호까지)
+                while frame_queue.get() is not None:
+                    pass
+
+        if written and self._video_writer_error is None:
+            encoder = f"ffmpeg/{_h264_encoder_args()[1]}" if ffmpeg is not None else "OpenCV/mp4v"
+            print(f"[Video] Saved {written} frames at {fps} FPS ({encoder})")
+
+    def _open_ffmpeg_pipe(self, output_path, width, height, fps):
+        """
+        raw rgba 프레임을 stdin으로 받아 H.264 MP4로 인코딩하는 ffmpeg 프로세스 시작
+        (alpha 제거 및 yuv420p 변환은 ffmpeg가 수행)
+
+        Returns:
+            subprocess.Popen: stdin 파이프가 열린 ffmpeg 프로세스
+        """
+        cmd = [
+            FFMPEG_BIN, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "rgba",
+            "-s", f"{width}x{height}", "-r", str(fps),
+            "-i", "pipe:",
+            *_h264_encoder_args(), "-pix_fmt", "yuv420p",
+            output_path
+        ]
+        # 기본 BufferedWriter: write()가 전체 프레임을 다 쓸 때까지 반복 (raw 파이프의 부분 쓰기 방지)
+        # 버퍼보다 큰 프레임은 내부 버퍼를 거치지 않고 바로 파이프로 전달됨
+        return subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL
+        )
 
     def execute_plan(self, plan_text, record_video=False, video_path=None):
         """
@@ -260,28 +507,9 @@ class PyBulletExecutor:
         print(f"\n[Executor] Received Plan: {plan_text}")
 
         # 비디오 녹화 시작
+        self.last_video_error = None
         if record_video:
-            if video_path is None:
-                import os
-                from datetime import datetime
-
-                # 출력 디렉토리 생성
-                output_dir = os.path.join(os.path.dirname(__file__), "simulation_outputs", "videos")
-                os.makedirs(output_dir, exist_ok=True)
-
-                # 타임스탬프로 파일명 생성
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                video_path = os.path.join(output_dir, f"simulation_{timestamp}.mp4")
-            else:
-                # 사용자가 경로를 지정한 경우에도 simulation_outputs/videos/ 폴더로 저장
-                import os
-                output_dir = os.path.join(os.path.dirname(__file__), "simulation_outputs", "videos")
-                os.makedirs(output_dir, exist_ok=True)
-
-                # 파일명만 추출하여 출력 폴더에 저장
-                video_filename = os.path.basename(video_path)
-                video_path = os.path.join(output_dir, video_filename)
-
+            video_path = self._resolve_video_path(video_path)
             self.start_video_recording(video_path)
 
         # 간단한 파싱 로직 (실제로는 더 복잡한 파서가 필요할 수 있음)
@@ -290,13 +518,11 @@ class PyBulletExecutor:
         target_obj = None
         active_robot = None
 
-        # 1. 대상 물체 식별
+        # 1. 대상 물체 식별 (미리 컴파일한 물체 이름 alternation으로 1회 스캔)
         plan_lower = plan_text.lower()
-        for obj_name in self.object_map.keys():
-            # Handle multi-word object names (e.g., "tuna_can" → "tuna can" or "tuna_can")
-            if obj_name.replace('_', ' ') in plan_lower or obj_name in plan_lower:
-                target_obj = obj_name
-                break
+        match = self._obj_regex.search(plan_lower) if self._obj_regex else None
+        if match:
+            target_obj = self._obj_alias_map[match.group(0)]
 
         # 2. 수행 로봇 식별
         # simulation_env.py의 robot_ids는 'kuka'와 'panda'를 사용
@@ -309,12 +535,11 @@ class PyBulletExecutor:
             print(f"[Executor] Action: {active_robot} -> Pick -> {target_obj}")
             success = self._perform_pick(active_robot, target_obj)
 
-            # 비디오 녹화 중지
-            if record_video:
-                self.stop_video_recording()
+            # 비디오 녹화 중지 (저장 실패는 동작 성공 여부와 별개로 last_video_error에 기록)
+            video_saved = record_video and self._finish_video_recording(video_path)
 
             result_msg = f"Picked {target_obj}"
-            if record_video and success:
+            if video_saved and success:
                 result_msg += f" (Video: {video_path})"
             return success, result_msg
         else:
@@ -341,28 +566,9 @@ class PyBulletExecutor:
         print(f"\n[Executor] Received Action Sequence: {len(action_sequence)} actions")
 
         # 비디오 녹화 시작
+        self.last_video_error = None
         if record_video:
-            if video_path is None:
-                import os
-                from datetime import datetime
-
-                # 출력 디렉토리 생성
-                output_dir = os.path.join(os.path.dirname(__file__), "simulation_outputs", "videos")
-                os.makedirs(output_dir, exist_ok=True)
-
-                # 타임스탬프로 파일명 생성
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                video_path = os.path.join(output_dir, f"simulation_{timestamp}.mp4")
-            else:
-                # 사용자가 경로를 지정한 경우에도 simulation_outputs/videos/ 폴더로 저장
-                import os
-                output_dir = os.path.join(os.path.dirname(__file__), "simulation_outputs", "videos")
-                os.makedirs(output_dir, exist_ok=True)
-
-                # 파일명만 추출하여 출력 폴더에 저장
-                video_filename = os.path.basename(video_path)
-                video_path = os.path.join(output_dir, video_filename)
-
+            video_path = self._resolve_video_path(video_path)
             self.start_video_recording(video_path)
 
         # 액션 시퀀스 순차 실행
@@ -372,16 +578,7 @@ class PyBulletExecutor:
             obj_name = action_dict.get('object', 'apple')
             robot_name = action_dict.get('robot', 'panda')
 
-            # 로봇 이름 매핑 (master_pipeline의 internal_robot_key → pybullet robot_id)
-            robot_map = {
-                'panda': 'panda',
-                'ur5e': 'kuka',  # UR5e는 KUKA로 매핑
-                'kuka_iiwa14': 'kuka',
-                'doosan_m0609': 'panda',  # Fallback
-                'doosan_m1013': 'panda',
-                'doosan_h2515': 'panda'
-            }
-            active_robot = robot_map.get(robot_name, 'panda')
+            active_robot = _ROBOT_MAP.get(robot_name, 'panda')
 
             print(f"\n[Executor] Action {i}/{len(action_sequence)}: {active_robot} {action_type} {obj_name}")
 
@@ -417,13 +614,11 @@ class PyBulletExecutor:
                 self.env.step()
                 self.capture_frame()
 
-        # 비디오 녹화 중지
-        if record_video:
-            self.stop_video_recording()
-
         # 성공 메시지
         result_msg = f"Completed {len(completed_actions)} actions: {' → '.join(completed_actions)}"
-        if record_video:
+
+        # 비디오 녹화 중지 (저장 실패는 동작 성공 여부와 별개로 last_video_error에 기록)
+        if record_video and self._finish_video_recording(video_path):
             result_msg += f" (Video: {video_path})"
 
         print(f"\n[OK] Action sequence completed successfully!")
@@ -438,6 +633,29 @@ class PyBulletExecutor:
             obj_map[obj_meta['name']] = obj_id
         return obj_map
 
+    def _build_object_matcher(self):
+        """
+        계획 텍스트에서 물체를 찾기 위한 정규식과 alias → 물체 이름 테이블 생성
+
+        "tuna_can"은 "tuna_can"과 "tuna can" 두 형태로 매칭되며, 긴 이름을 먼저 시도하여
+        "can"처럼 다른 이름에 포함된 짧은 이름보다 우선함.
+
+        Returns:
+            (re.Pattern or None, dict): (alternation 정규식, {alias: obj_name})
+        """
+        alias_map = {}
+        for obj_name in self.object_map:
+            # Handle multi-word object names (e.g., "tuna_can" → "tuna can" or "tuna_can")
+            alias_map.setdefault(obj_name, obj_name)
+            alias_map.setdefault(obj_name.replace('_', ' '), obj_name)
+
+        if not alias_map:
+            return None, alias_map
+
+        aliases = sorted(alias_map, key=len, reverse=True)
+        pattern = re.compile('|'.join(map(re.escape, aliases)))
+        return pattern, alias_map
+
     def _extract_ee_links(self):
         """
         Extract end-effector link indices from robot metadata.
@@ -455,7 +673,31 @@ class PyBulletExecutor:
 
         return ee_links
 
-    def move_to_pose(self, robot_name, target_pos, target_orn=None, max_steps=2000, error_threshold=0.02):
+    def _build_ik_tables(self):
+        """
+        로봇별 calculateInverseKinematics 고정 인자와 제어 조인트 수 생성
+
+        Returns:
+            (dict, dict): ({robot_name: IK kwargs}, {robot_name: controllable_joints})
+        """
+        ik_kwargs = {}
+        controllable = {}
+        for robot_key in self.robot_ids:
+            config = self.robot_metadata[robot_key]['config']
+            joint_limits = config.get('joint_limits', {})
+            ik_kwargs[robot_key] = dict(
+                lowerLimits=joint_limits.get('lower'),
+                upperLimits=joint_limits.get('upper'),
+                jointRanges=joint_limits.get('ranges'),
+                restPoses=joint_limits.get('rest_poses'),
+                maxNumIterations=IK_MAX_ITERS_COLD,
+                residualThreshold=1e-4
+            )
+            controllable[robot_key] = config['controllable_joints']
+        return ik_kwargs, controllable
+
+    def move_to_pose(self, robot_name, target_pos, target_orn=None, max_steps=2000, error_threshold=0.02,
+                     via_point=False):
         """
         로봇을 목표 위치로 이동 (Real IK + Motor Control)
 
@@ -465,36 +707,48 @@ class PyBulletExecutor:
             target_orn: 목표 방향 (quaternion), None이면 현재 방향 유지
             max_steps: 최대 시뮬레이션 스텝 수
             error_threshold: 목표 도달 판단 임계값 (m)
+            via_point: True면 중간 경유점으로 취급 - VIA_POINT_THRESHOLD 이내면 통과하며,
+                       stuck/timeout 시에도 이 임계값을 넘는 오차는 허용하지 않음
+                       (primitive의 최종 자세에는 사용하지 말 것)
 
         Returns:
             bool: 성공 여부
         """
         robot_id = self.robot_ids[robot_name]
         ee_link = self.ee_link_indices[robot_name]
-        metadata = self.robot_metadata[robot_name]
+
+        # stuck/timeout 시 근사 도달로 인정할 최대 오차
+        if via_point:
+            error_threshold = VIA_POINT_THRESHOLD
+            stuck_accept = timeout_accept = VIA_POINT_THRESHOLD
+        else:
+            stuck_accept = error_threshold * 2      # Accept if within 2x threshold
+            timeout_accept = error_threshold * 1.5
 
         # 기본 방향 설정 (downward grasp)
         if target_orn is None:
-            target_orn = p.getQuaternionFromEuler([np.pi, 0, 0])
+            target_orn = self._down_orn
+
+        # 1. IK 계산 with joint limits from metadata (__init__에서 준비한 인자)
+        ik_kwargs = self._ik_kwargs[robot_name]
 
-        # 1. IK 계산 with joint limits from metadata
-        joint_limits = metadata['config'].get('joint_limits', {})
+        # 이전 해가 있으면 restPoses로 사용 (warm-start) → 적은 반복으로 수렴
+        last_ik = self._last_ik.get(robot_name)
+        if last_ik is not None:
+            ik_kwargs = dict(ik_kwargs, restPoses=last_ik, maxNumIterations=IK_MAX_ITERS_WARM)
 
         joint_poses = p.calculateInverseKinematics(
             robot_id,
             ee_link,
             target_pos,
             target_orn,
-            lowerLimits=joint_limits.get('lower'),
-            upperLimits=joint_limits.get('upper'),
-            jointRanges=joint_limits.get('ranges'),
-            restPoses=joint_limits.get('rest_poses'),
-            maxNumIterations=200,
-            residualThreshold=1e-4
+            **ik_kwargs
         )
+        self._last_ik[robot_name] = joint_poses
 
         # 2. 모터 제어로 조인트 이동 (controllable_joints만)
-        controllable_joints = metadata['config']['controllable_joints']
+        # setJointMotorControlArray는 maxVelocity를 지원하지 않으므로 조인트별 호출 유지
+        controllable_joints = self._controllable_joints[robot_name]
 
         for i in range(controllable_joints):
             p.setJointMotorControl2(
@@ -507,22 +761,41 @@ class PyBulletExecutor:
             )
 
         # 3. 시뮬레이션 스텝 실행 (도달할 때까지)
+        # EE 오차 확인/프레임 캡처는 CONTROL_CHECK_INTERVAL 스텝마다만 수행하고,
+        # 실시간 sleep은 GUI로 사람이 볼 때만 적용 (headless에서는 최대 속도)
+        target_xyz = tuple(target_pos)
+        realtime = self.env.gui
+        next_tick = time.perf_counter()
         min_error = float('inf')
         stuck_counter = 0
+        stuck_limit = STUCK_STEPS // CONTROL_CHECK_INTERVAL
 
         for step in range(max_steps):
             self.env.step()
 
-            # 비디오 녹화 중이면 프레임 캡처 (매 5 스텝마다)
-            if self.is_recording and step % 5 == 0:
+            # Real-time simulation: 고정 sleep 대신 다음 스텝 기준 시각까지만 대기
+            # (sleep 오버슈트/캡처 시간이 누적되어 240Hz보다 느려지지 않도록)
+            if realtime:
+                next_tick += SIM_TIME_STEP
+                slack = next_tick - time.perf_counter()
+                if slack > 0:
+                    time.sleep(slack)
+                elif slack < -REALTIME_MAX_LAG:
+                    next_tick = time.perf_counter()
+
+            if step % CONTROL_CHECK_INTERVAL != 0:
+                continue
+
+            # 비디오 녹화 중이면 프레임 캡처
+            if self.is_recording:
                 self.capture_frame()
 
             # 현재 EE 위치 확인
             link_state = p.getLinkState(robot_id, ee_link)
             current_pos = link_state[4]  # World position
 
-            # 목표 도달 체크
-            error = np.linalg.norm(np.array(target_pos) - np.array(current_pos))
+            # 목표 도달 체크 (math.dist: 임시 배열 할당 없는 C 구현 3D 거리)
+            error = math.dist(target_xyz, current_pos)
 
             # Track minimum error
             if error < min_error:
@@ -536,10 +809,10 @@ class PyBulletExecutor:
                 print(f"  > Reached target (error: {error:.4f}m in {step} steps)")
                 return True
 
-            # Early exit if stuck (error not improving for 200 steps)
-            if stuck_counter > 200:
+            # Early exit if stuck (error not improving for STUCK_STEPS steps)
+            if stuck_counter > stuck_limit:
                 print(f"  [Warning] {robot_name} stuck at error {min_error:.4f}m")
-                if min_error < error_threshold * 2:  # Accept if within 2x threshold
+                if min_error < stuck_accept:
                     print(f"  > Accepting approximate position")
                     return True
                 return False
@@ -547,11 +820,9 @@ class PyBulletExecutor:
             if step % 100 == 0 and step > 0:
                 print(f"  > Step {step}/{max_steps}, error: {error:.4f}m")
 
-            time.sleep(1./240.)  # Real-time simulation
-
         print(f"  [Warning] {robot_name} timeout. Final error: {min_error:.4f}m")
         # Accept if close enough
-        if min_error < error_threshold * 1.5:
+        if min_error < timeout_accept:
             print(f"  > Accepting final position")
             return True
 
@@ -569,19 +840,17 @@ class PyBulletExecutor:
         # 그리퍼 닫기 (gripper_joints가 있는 로봇만)
         gripper_joints = metadata['config'].get('gripper_joints', [])
         if gripper_joints:
-            for gripper_joint in gripper_joints:
-                p.setJointMotorControl2(
-                    robot_id,
-                    gripper_joint,
-                    p.POSITION_CONTROL,
-                    targetPosition=0.0,  # 닫힘
-                    force=100
-                )
+            # 모든 그리퍼 조인트를 한 번의 호출로 제어
+            p.setJointMotorControlArray(
+                robot_id,
+                gripper_joints,
+                p.POSITION_CONTROL,
+                targetPositions=[0.0] * len(gripper_joints),  # 닫힘
+                forces=[100] * len(gripper_joints)
+            )
 
-            # 그리퍼 닫히는 동안 대기
-            for _ in range(50):
-                self.env.step()
-                time.sleep(1./240.)
+            # 그리퍼 닫히는 동안 대기 (50 스텝을 한 번의 stepSimulation으로)
+            self.env.step_many(50)
 
         # Magic Grasp: Fixed Constraint 생성
         constraint_id = p.createConstraint(
@@ -614,18 +883,16 @@ class PyBulletExecutor:
 
             if gripper_joints:
                 robot_id = self.robot_ids[robot_name]
-                for gripper_joint in gripper_joints:
-                    p.setJointMotorControl2(
-                        robot_id,
-                        gripper_joint,
-                        p.POSITION_CONTROL,
-                        targetPosition=0.04,  # Open
-                        force=100
-                    )
-
-                # Wait for gripper to open
-                for _ in range(50):
-                    self.env.step()
+                p.setJointMotorControlArray(
+                    robot_id,
+                    gripper_joints,
+                    p.POSITION_CONTROL,
+                    targetPositions=[0.04] * len(gripper_joints),  # Open
+                    forces=[100] * len(gripper_joints)
+                )
+
+                # Wait for gripper to open (50 스텝을 한 번의 stepSimulation으로)
+                self.env.step_many(50)
 
             print(f"  > Released object")
             return True
@@ -635,18 +902,17 @@ class PyBulletExecutor:
         """
         PyBullet에서 실제 픽 동작을 수행 (Real Physics Control)
         """
-        robot_id = self.robot_ids[robot_name]
         obj_id = self.object_map[obj_name]
 
-        # 1. 물체 위치 가져오기
-        obj_info = self.env.get_object_info(obj_id)
-        target_pos = obj_info['position']
+        # 1. 물체 위치 가져오기 (위치만 필요하므로 get_object_info의 메타데이터 복사 생략)
+        target_pos = list(p.getBasePositionAndOrientation(obj_id)[0])
         print(f"  > Target Position: {target_pos}")
 
         # 2. 접근 (Move to Hover) - 물체 위 20cm
         hover_pos = [target_pos[0], target_pos[1], target_pos[2] + 0.2]
         print(f"  > Moving {robot_name} to hover position...")
-        success = self.move_to_pose(robot_name, hover_pos)
+        # hover는 중간 경유점이므로 느슨한 임계값으로 통과하고 곧바로 하강 (정밀 수렴 대기 생략)
+        success = self.move_to_pose(robot_name, hover_pos, via_point=True)
         if not success:
             print(f"  [ERROR] Failed to reach hover position")
             return False
@@ -696,7 +962,6 @@ class PyBulletExecutor:
         robot_id = self.robot_ids[robot_name]
         ee_link = self.ee_link_indices[robot_name]
 
-        import pybullet as p
         link_state = p.getLinkState(robot_id, ee_link)
         current_pos = link_state[4]  # World position of end-effector
 
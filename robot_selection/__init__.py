@@ -20,20 +20,24 @@ Usage:
 
 from .robot_selector import (
     select_best_robot,
+    load_robot_db,
     calculate_payload_score,
     calculate_reach_score,
     calculate_dof_score,
     parse_requirements_from_tdl,
-    print_selection_report
+    print_selection_report,
+    PayloadDetails
 )
 
 __all__ = [
     'select_best_robot',
+    'load_robot_db',
     'calculate_payload_score',
     'calculate_reach_score',
     'calculate_dof_score',
     'parse_requirements_from_tdl',
-    'print_selection_report'
+    'print_selection_report',
+    'PayloadDetails'
 ]
 
 __version__ = '1.0.0'
@@ -0,0 +1,8 @@
+# __main__.py
+"""
+Entry point for `python -m robot_selection` (runs the interactive demo)
+"""
+
+from .demo import main
+
+main()
@@ -2,13 +2,10 @@
 """
 Robot Selector Demo
 Demonstrates integration with TDL_generation module
-"""
-
-import sys
-import os
 
-# Add parent directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+Usage (프로젝트 루트에서 실행):
+    python -m robot_selection          # 또는 python -m robot_selection.demo
+"""
 
 from robot_selection import select_best_robot, print_selection_report
 
@@ -158,7 +155,10 @@ GOAL Execute_Process()
     print("="*80 + "\n")
 
 
-if __name__ == "__main__":
+def main():
+    """
+    Run both demos in sequence
+    """
     print("\n" + "="*80)
     print("ROBOT SELECTOR MODULE - INTERACTIVE DEMO")
     print("="*80)
@@ -182,3 +182,7 @@ if __name__ == "__main__":
     print("3. Multi-criteria optimization (Payload, Reach, DoF)")
     print("4. Ready for integration with Parameter Conversion module")
     print("="*80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,54 @@ Robot Selector Module (Contribution 2)
 Selects the optimal robot based on TDL requirements to prevent over-specification
 """
 
+import copy
+import hashlib
 import json
 import math
 import os
+import re
+import sys
 import logging
-from typing import Dict, Tuple, Optional
+from functools import lru_cache
+from typing import Dict, NamedTuple, Tuple, Optional
+
+import numpy as np
+
+# JSON 파서: orjson(선택 의존성)이 있으면 사용, 없으면 표준 json
+# (orjson.JSONDecodeError는 json.JSONDecodeError의 하위 클래스라 예외 처리는 동일)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads  # bytes 입력 지원
 
 logger = logging.getLogger(__name__)
 
 
+# Payload 점수 파라미터 (스칼라/벡터 버전 공용)
+ALPHA_P = 1.2       # Safety Margin (1.2배가 최적)
+SIGMA_REL = 0.20    # 상대적 허용 편차
+THRESHOLD = 3.0     # 과스펙 판정 기준 (3배 이상이면 로그 스케일 적용)
+LOG_BETA = 0.8      # 로그 스케일 페널티 계수
+
+# Reach 점수 파라미터 (이 값은 태스크의 특성에 따라 조절 가능)
+ALPHA_R = 1.5       # Growth Rate (값이 클수록 점수 상승이 빠름)
+
+# 파생 상수 (호출마다 다시 계산하지 않도록 미리 계산)
+_INV_TWO_SIGMA2 = 1.0 / (2 * SIGMA_REL ** 2)   # 1 / (2σ²) = 12.5
+_LOG_ALPHA_P = math.log(ALPHA_P)               # log(ratio/α) = log(ratio) - log(α)
+
+
 # --- 1. 점수 계산 함수 (수식) ---
 
+class PayloadDetails(NamedTuple):
+    """Payload 점수 상세 정보 (로봇마다 dict를 만드는 대신 가벼운 튜플 사용)"""
+    ratio: float        # 로봇 용량 / 요구 페이로드
+    gaussian: float     # 가우시안 모드일 때의 점수 (아니면 0)
+    log_penalty: float  # 로그 스케일 모드일 때의 페널티 (아니면 0)
+    mode: str           # 'insufficient' | 'gaussian' | 'log_scale'
+
+
 def calculate_payload_score(robot_payload: float, required_payload: float, return_details: bool = False):
     """
     Payload 점수(Sp)를 계산합니다. (로그 스케일 역비례 방식 적용)
@@ -26,7 +63,7 @@ def calculate_payload_score(robot_payload: float, required_payload: float, retur
         return_details: True면 상세 정보도 반환
 
     Returns:
-        Payload 점수 (0.0 ~ 1.0) 또는 (점수, 상세정보dict)
+        Payload 점수 (0.0 ~ 1.0) 또는 (점수, PayloadDetails)
 
     Formula:
         S_p = 0                                                      if p_c < p_r
@@ -50,15 +87,9 @@ def calculate_payload_score(robot_payload: float, required_payload: float, retur
             * Doosan(25kg, 208배): 0.06점
             → 변별력 확보!
     """
-    # 파라미터
-    ALPHA_P = 1.2       # Safety Margin (1.2배가 최적)
-    SIGMA_REL = 0.20    # 상대적 허용 편차
-    THRESHOLD = 3.0     # 과스펙 판정 기준 (3배 이상이면 로그 스케일 적용)
-    LOG_BETA = 0.8      # 로그 스케일 페널티 계수
-
     if robot_payload < required_payload:
         if return_details:
-            return 0.0, {'ratio': 0, 'gaussian': 0, 'log_penalty': 0, 'mode': 'insufficient'}
+            return 0.0, PayloadDetails(0, 0, 0, 'insufficient')
         return 0.0
 
     # 상대 비율 계산
@@ -67,33 +98,23 @@ def calculate_payload_score(robot_payload: float, required_payload: float, retur
     # Case 1: 적정 스펙 범위 (ratio <= THRESHOLD) → 가우시안
     if ratio <= THRESHOLD:
         deviation = ratio - ALPHA_P
-        score = math.exp(-(deviation ** 2) / (2 * SIGMA_REL ** 2))
+        score = math.exp(-(deviation * deviation) * _INV_TWO_SIGMA2)
 
         if return_details:
-            return score, {
-                'ratio': ratio,
-                'gaussian': score,
-                'log_penalty': 0,
-                'mode': 'gaussian'
-            }
+            return score, PayloadDetails(ratio, score, 0, 'gaussian')
         return score
 
     # Case 2: 과스펙 범위 (ratio > THRESHOLD) → 로그 스케일 역비례
     # 로그 페널티: β * log(ratio / α)
     # ratio가 클수록 점수 급격히 감소
-    log_penalty = LOG_BETA * math.log(ratio / ALPHA_P)
+    log_penalty = LOG_BETA * (math.log(ratio) - _LOG_ALPHA_P)
     score = math.exp(-log_penalty)
 
     # 최소값 보장 (완전히 0이 되지 않도록)
     score = max(score, 0.01)
 
     if return_details:
-        return score, {
-            'ratio': ratio,
-            'gaussian': 0,
-            'log_penalty': log_penalty,
-            'mode': 'log_scale'
-        }
+        return score, PayloadDetails(ratio, 0, log_penalty, 'log_scale')
     return score
 
 
@@ -113,17 +134,14 @@ def calculate_reach_score(robot_reach: float, required_reach: float) -> float:
         S_r = 1 - exp(-ALPHA_R * (robot_reach - required_reach))
         if robot_reach >= required_reach, else 0
     """
-    # 이 값은 태스크의 특성에 따라 조절 가능
-    ALPHA_R = 1.5  # Growth Rate (값이 클수록 점수 상승이 빠름)
-
     if robot_reach < required_reach:
         return 0.0
     else:
         # 요구사항 대비 초과된 Reach
         diff = robot_reach - required_reach
 
-        # 1 - exp(-alpha * diff)
-        score = 1.0 - math.exp(-ALPHA_R * diff)
+        # 1 - exp(-alpha * diff) (expm1: diff가 작을 때도 정확)
+        score = -math.expm1(-ALPHA_R * diff)
         return score
 
 
@@ -152,8 +170,67 @@ def calculate_dof_score(robot_dof: int, required_dof: int) -> float:
         return 0.8
 
 
+# --- 1-1. 벡터화 점수 계산 (select_best_robot 내부용) ---
+# 위 스칼라 함수들과 동일한 수식을 로봇 DB 전체 배열에 한 번에 적용
+
+def _payload_scores(payload: np.ndarray, required: float):
+    """
+    calculate_payload_score의 벡터 버전
+
+    Returns:
+        (scores, ratios, log_penalties, modes)
+        - modes: 0 = insufficient, 1 = gaussian, 2 = log_scale
+        - insufficient 로봇의 ratio/log_penalty는 0
+        - exp/log는 해당 모드의 로봇에 대해서만 계산 (insufficient는 0점이므로 건너뜀)
+    """
+    ok = payload >= required
+    ratio = np.zeros(payload.shape)
+    scores = np.zeros(payload.shape)
+    log_penalty = np.zeros(payload.shape)
+
+    with np.errstate(divide='ignore'):
+        np.divide(payload, required, out=ratio, where=ok)
+    gaussian_mode = ok & (ratio <= THRESHOLD)
+    log_mode = ok & ~gaussian_mode
+
+    deviation = ratio[gaussian_mode] - ALPHA_P
+    scores[gaussian_mode] = np.exp(-(deviation * deviation) * _INV_TWO_SIGMA2)
+
+    log_penalty[log_mode] = LOG_BETA * (np.log(ratio[log_mode]) - _LOG_ALPHA_P)
+    scores[log_mode] = np.maximum(np.exp(-log_penalty[log_mode]), 0.01)
+
+    modes = gaussian_mode.astype(np.int8) + 2 * log_mode.astype(np.int8)
+    return scores, ratio, log_penalty, modes
+
+
+def _reach_scores(reach: np.ndarray, required: float) -> np.ndarray:
+    """calculate_reach_score의 벡터 버전 (반경이 부족한 로봇은 계산 없이 0점)"""
+    ok = reach >= required
+    scores = np.zeros(reach.shape)
+    scores[ok] = -np.expm1(-ALPHA_R * (reach[ok] - required))
+    return scores
+
+
+def _dof_scores(dof: np.ndarray, required: int) -> np.ndarray:
+    """calculate_dof_score의 벡터 버전"""
+    return np.where(dof < required, 0.0, np.where(dof == required, 1.0, 0.8))
+
+
+_PAYLOAD_MODES = ('insufficient', 'gaussian', 'log_scale')
+
+
 # --- 2. TDL 파서 ---
 
+# 요구사항 키워드 alternation (TDL 전체를 한 번에 스캔, lastgroup으로 종류 구분)
+_REQUIREMENT_RE = re.compile(
+    r'PAYLOAD_KG\s*:\s*(?P<payload_kg>\S*)'
+    r'|SetWorkpieceWeight\s*\(\s*(?P<workpiece>[\d.]+)'
+    r'|REACH_M\s*:\s*(?P<reach>\S*)'
+    r'|PosX\s*\(\s*(?P<posx_x>[\d.]+)\s*,\s*(?P<posx_y>[\d.]+)'
+    r'|DOF\s*:\s*(?P<dof>\S*)'
+)
+
+
 def parse_requirements_from_tdl(tdl_content: str) -> Dict:
     """
     TDL 파일에서 요구사항을 추출합니다.
@@ -165,8 +242,6 @@ def parse_requirements_from_tdl(tdl_content: str) -> Dict:
     Returns:
         요구사항 딕셔너리 {'payload': float, 'reach': float, 'dof': int}
     """
-    import re
-
     requirements = {
         'payload': 1.0,  # 기본값 (kg) - 작은 물체를 위한 현실적인 기본값
         'reach': 0.8,    # 기본값 (m)
@@ -175,70 +250,73 @@ def parse_requirements_from_tdl(tdl_content: str) -> Dict:
 
     # 파싱 플래그 (우선순위 관리)
     payload_found = False
+    reach_explicit = False  # REQUIRED_REACH_M이 있으면 PosX 추정은 생략
+    max_xy2 = 0.0           # PosX 목표점 중 가장 먼 점의 x^2 + y^2 (mm^2)
 
-    # TDL 라인을 읽으며 요구사항 파싱
-    for line in tdl_content.split('\n'):
-        line = line.strip()
+    # TDL 전체를 한 번만 스캔하며 요구사항 키워드를 등장 순서대로 처리
+    for match in _REQUIREMENT_RE.finditer(tdl_content):
+        kind = match.lastgroup
 
-        # 1. 명시적 요구사항 키워드 찾기 (최고 우선순위)
-        if "PAYLOAD_KG" in line:
+        # 1. 명시적 요구사항 키워드 (최고 우선순위)
+        # 예: "PAYLOAD_KG: 15.0" or "// PAYLOAD_KG: 15.0"
+        if kind == 'payload_kg':
             try:
-                # 예: "PAYLOAD_KG: 15.0" or "// PAYLOAD_KG: 15.0"
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    requirements['payload'] = float(parts[1].strip())
-                    payload_found = True
-                    logger.info(f"[TDL Parser] Found explicit PAYLOAD_KG: {requirements['payload']} kg")
-            except (ValueError, IndexError):
-                logger.warning(f"Failed to parse PAYLOAD_KG from line: {line}")
-
-        # 2. SetWorkpieceWeight 파싱 (우선순위: 명시적 PAYLOAD_KG가 없을 때만)
-        if "SetWorkpieceWeight" in line and not payload_found:
+                requirements['payload'] = float(match.group('payload_kg'))
+                payload_found = True
+                logger.info(f"[TDL Parser] Found explicit PAYLOAD_KG: {requirements['payload']} kg")
+            except ValueError:
+                logger.warning(f"Failed to parse PAYLOAD_KG from: {match.group(0)}")
+
+        # 2. SetWorkpieceWeight (우선순위: 명시적 PAYLOAD_KG가 없을 때만)
+        # 예: "SetWorkpieceWeight(15.0, Trans(...))" or "SetWorkpieceWeight(15, ...)"
+        elif kind == 'workpiece':
+            if payload_found:
+                continue
             try:
-                # 예: "SetWorkpieceWeight(15.0, Trans(...))" or "SetWorkpieceWeight(15, ...)"
-                match = re.search(r'SetWorkpieceWeight\s*\(\s*([\d.]+)', line)
-                if match:
-                    weight = float(match.group(1))
-                    requirements['payload'] = weight
-                    payload_found = True
-                    logger.info(f"[TDL Parser] Found SetWorkpieceWeight: {weight} kg")
-            except (ValueError, AttributeError) as e:
-                logger.warning(f"Failed to parse SetWorkpieceWeight from line: {line}, error: {e}")
-
-        # REQUIRED_REACH_M 키워드 찾기
-        if "REQUIRED_REACH_M" in line or "REACH_M" in line:
+                weight = float(match.group('workpiece'))
+                requirements['payload'] = weight
+                payload_found = True
+                logger.info(f"[TDL Parser] Found SetWorkpieceWeight: {weight} kg")
+            except ValueError as e:
+                logger.warning(f"Failed to parse SetWorkpieceWeight from: {match.group(0)}, error: {e}")
+
+        # REQUIRED_REACH_M (또는 REACH_M) 키워드
+        # 예: "REQUIRED_REACH_M: 1.1"
+        elif kind == 'reach':
             try:
-                # 예: "REQUIRED_REACH_M: 1.1"
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    requirements['reach'] = float(parts[1].strip())
-                    logger.info(f"[TDL Parser] Found explicit REQUIRED_REACH_M: {requirements['reach']} m")
-            except (ValueError, IndexError):
-                logger.warning(f"Failed to parse REQUIRED_REACH_M from line: {line}")
-
-        # 3. PosX에서 reach 추정 (대략적)
-        if "PosX" in line and requirements['reach'] == 0.8:  # 기본값일 때만
+                requirements['reach'] = float(match.group('reach'))
+                reach_explicit = True
+                logger.info(f"[TDL Parser] Found explicit REQUIRED_REACH_M: {requirements['reach']} m")
+            except ValueError:
+                logger.warning(f"Failed to parse REQUIRED_REACH_M from: {match.group(0)}")
+
+        # 3. PosX에서 reach 추정 (대략적, 명시적 reach가 없을 때만 - 가장 먼 점 기준)
+        # 예: "PosX(1200, 300, 500, ...)" → reach ≈ sqrt(x^2 + y^2) / 1000
+        # 루프에서는 최대 x^2 + y^2만 누적하고 sqrt는 루프 후 한 번만 계산
+        elif kind == 'posx_y':
+            if reach_explicit:
+                continue
             try:
-                # 예: "PosX(1200, 300, 500, ...)" → reach ≈ sqrt(x^2 + y^2) / 1000
-                match = re.search(r'PosX\s*\(\s*([\d.]+)\s*,\s*([\d.]+)', line)
-                if match:
-                    x = float(match.group(1))
-                    y = float(match.group(2))
-                    estimated_reach = ((x**2 + y**2) ** 0.5) / 1000.0  # mm → m
-                    # 안전마진 추가
-                    requirements['reach'] = max(requirements['reach'], estimated_reach * 1.1)
-            except (ValueError, AttributeError):
-                pass
-
-        # 3. REQUIRED_DOF 키워드 찾기
-        if "REQUIRED_DOF" in line or "DOF" in line:
+                x = float(match.group('posx_x'))
+                y = float(match.group('posx_y'))
+            except ValueError:
+                continue
+            xy2 = x * x + y * y
+            if xy2 > max_xy2:
+                max_xy2 = xy2
+
+        # 4. REQUIRED_DOF (또는 DOF) 키워드
+        # 예: "REQUIRED_DOF: 6"
+        elif kind == 'dof':
             try:
-                # 예: "REQUIRED_DOF: 6"
-                parts = line.split(':')
-                if len(parts) >= 2:
-                    requirements['dof'] = int(float(parts[1].strip()))
-            except (ValueError, IndexError):
-                logger.warning(f"Failed to parse REQUIRED_DOF from line: {line}")
+                requirements['dof'] = int(float(match.group('dof')))
+            except ValueError:
+                logger.warning(f"Failed to parse REQUIRED_DOF from: {match.group(0)}")
+
+    # PosX 기반 reach 추정 확정 (mm → m, 안전마진 1.1배)
+    if not reach_explicit and max_xy2 > 0:
+        estimated_reach = math.sqrt(max_xy2) / 1000.0
+        requirements['reach'] = max(requirements['reach'], estimated_reach * 1.1)
 
     # 최종 로깅 (소스 표시)
     payload_source = "SetWorkpieceWeight" if payload_found else "default(1.0kg)"
@@ -248,12 +326,70 @@ def parse_requirements_from_tdl(tdl_content: str) -> Dict:
     return requirements
 
 
-# --- 3. 메인 선택 함수 ---
+# --- 3. 로봇 DB 로드 (캐시) ---
+
+# 기본 로봇 DB 경로: 현재 파일의 data/ 폴더
+DEFAULT_ROBOT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'robot_db.json')
+
+
+@lru_cache(maxsize=8)
+def _load_robot_db(robot_db_path: str, mtime: float) -> Tuple:
+    """
+    robot_db.json을 읽어 점수 계산용 SoA 배열과 함께 반환합니다.
+    (경로, 수정 시각) 기준으로 캐시되므로 파일이 바뀌면 자동으로 다시 읽습니다.
+
+    Args:
+        robot_db_path: robot_db.json 파일 경로
+        mtime: 파일 수정 시각 (캐시 키 용도)
+
+    Returns:
+        (robot_db, robot_ids, specs_list, payload_arr, reach_arr, dof_arr)
+        배열은 캐시 간 공유되므로 읽기 전용
+    """
+    with open(robot_db_path, 'rb') as f:
+        robot_db = _json_loads(f.read())
+    logger.info(f"[RobotSelector] Loaded {len(robot_db)} robots from: {robot_db_path}")
+
+    robot_ids = tuple(robot_db)
+    specs_list = tuple(robot_db.values())
+    n = len(specs_list)
+    payload_arr = np.fromiter((r['payload'] for r in specs_list), dtype=np.float64, count=n)
+    reach_arr = np.fromiter((r['reach'] for r in specs_list), dtype=np.float64, count=n)
+    dof_arr = np.fromiter((r['dof'] for r in specs_list), dtype=np.int64, count=n)
+    for arr in (payload_arr, reach_arr, dof_arr):
+        arr.setflags(write=False)
+
+    return robot_db, robot_ids, specs_list, payload_arr, reach_arr, dof_arr
+
+
+def load_robot_db(robot_db_path: str = None) -> Dict:
+    """
+    robot_db.json을 (경로, 수정 시각) 기준 캐시를 통해 로드합니다.
+    로봇 선택/시뮬레이터/파이프라인이 같은 파싱 결과(캐시)를 사용합니다.
+
+    Args:
+        robot_db_path: robot_db.json 파일 경로 (None이면 기본 경로 사용)
+
+    Returns:
+        dict: robot_id → 로봇 스펙 (호출마다 새 복사본이므로 수정해도 캐시에 영향 없음)
+    """
+    if robot_db_path is None:
+        robot_db_path = DEFAULT_ROBOT_DB_PATH
+    return copy.deepcopy(_load_robot_db(robot_db_path, os.stat(robot_db_path).st_mtime)[0])
+
+
+# --- 4. 메인 선택 함수 ---
+
+# 선택 결과 캐시 (use_cache=True일 때만 사용, FIFO 방식으로 최대 SELECT_CACHE_SIZE개 유지)
+SELECT_CACHE_SIZE = 128
+_SELECT_CACHE: Dict[tuple, tuple] = {}
+
 
 def select_best_robot(
     tdl_v1_content: str,
     robot_db_path: str = None,
-    weights: Dict[str, float] = None
+    weights: Dict[str, float] = None,
+    use_cache: bool = False
 ) -> Tuple[str, float, Dict]:
     """
     모듈 2의 메인 함수입니다.
@@ -263,6 +399,8 @@ def select_best_robot(
         tdl_v1_content: TDL v1 코드 (문자열)
         robot_db_path: robot_db.json 파일 경로 (None이면 기본 경로 사용)
         weights: 점수 가중치 딕셔너리 {'payload': float, 'reach': float, 'dof': float}
+        use_cache: True면 (TDL 해시, DB 경로/수정 시각, 가중치)가 같은 이전 결과를 재사용
+                   (캐시된 all_scores 딕셔너리는 호출 간 공유되므로 수정하지 말 것)
 
     Returns:
         Tuple of (best_robot_id, best_score, all_scores_dict)
@@ -274,14 +412,13 @@ def select_best_robot(
 
     # 1. 로봇 DB 로드
     if robot_db_path is None:
-        # 기본 경로: 현재 파일의 data/ 폴더
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        robot_db_path = os.path.join(current_dir, 'data', 'robot_db.json')
+        robot_db_path = DEFAULT_ROBOT_DB_PATH
 
     try:
-        with open(robot_db_path, 'r', encoding='utf-8') as f:
-            robot_db = json.load(f)
-        logger.info(f"[RobotSelector] Loaded {len(robot_db)} robots from: {robot_db_path}")
+        mtime = os.stat(robot_db_path).st_mtime
+        robot_db, robot_ids, specs_list, payload_arr, reach_arr, dof_arr = _load_robot_db(
+            robot_db_path, mtime
+        )
     except FileNotFoundError:
         error_msg = f"Error: 로봇 DB 로드 실패 - {robot_db_path} 파일을 찾을 수 없습니다."
         logger.error(error_msg)
@@ -291,6 +428,17 @@ def select_best_robot(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
+    # 1-1. 동일 요청이면 파싱/점수 계산 생략
+    cache_key = None
+    if use_cache:
+        tdl_hash = hashlib.blake2b(tdl_v1_content.encode('utf-8'), digest_size=16).digest()
+        weights_key = None if weights is None else tuple(sorted(weights.items()))
+        cache_key = (tdl_hash, robot_db_path, mtime, weights_key)
+        cached = _SELECT_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"[RobotSelector] 캐시된 선택 결과 사용: {cached[0]}")
+            return cached
+
     # 2. TDL 요구사항 파싱
     reqs = parse_requirements_from_tdl(tdl_v1_content)
     req_payload = reqs.get('payload', 0.0)
@@ -327,56 +475,62 @@ def select_best_robot(
             f"  목적: 과소비 방지 - 작은 로봇 우선 선택"
         )
 
-    # 가중치 합계가 1.0인지 확인
-    total_weight = sum(weights.values())
+    # 가중치 합계가 1.0인지 확인 (키가 3개로 고정이므로 직접 언패킹)
+    wp, wr, wd = weights['payload'], weights['reach'], weights['dof']
+    total_weight = wp + wr + wd
     if not math.isclose(total_weight, 1.0, rel_tol=1e-5):
         logger.warning(f"[RobotSelector] 가중치 합계가 1.0이 아닙니다: {total_weight}. 정규화합니다.")
-        weights = {k: v / total_weight for k, v in weights.items()}
+        wp, wr, wd = wp / total_weight, wr / total_weight, wd / total_weight
 
     # 4. 모든 로봇에 대해 점수 계산
     all_scores = {}
     logger.info("="*80)
     logger.info(f"[RobotSelector] 로봇 선정 시작")
     logger.info(f"요구사항: Payload={req_payload}kg, Reach={req_reach}m, DoF={req_dof}")
-    logger.info(f"가중치: Payload={weights['payload']}, Reach={weights['reach']}, DoF={weights['dof']}")
+    logger.info(f"가중치: Payload={wp}, Reach={wr}, DoF={wd}")
     logger.info("="*80)
 
-    for robot_id, specs in robot_db.items():
-        # 4-1. 개별 점수 계산
-        s_p, p_details = calculate_payload_score(specs['payload'], req_payload, return_details=True)
-        s_r = calculate_reach_score(specs['reach'], req_reach)
-        s_d = calculate_dof_score(specs['dof'], req_dof)
-
-        # 4-2. 최종 가중합 계산
-        s_total = (
-            weights['payload'] * s_p +
-            weights['reach'] * s_r +
-            weights['dof'] * s_d
-        )
+    # 4-1. 캐시된 SoA 배열로 전체 로봇 점수를 한 번에 계산
+    s_p_arr, ratio_arr, log_penalty_arr, mode_arr = _payload_scores(payload_arr, req_payload)
+    s_r_arr = _reach_scores(reach_arr, req_reach)
+    s_d_arr = _dof_scores(dof_arr, req_dof)
+
+    # 4-2. 최종 가중합 계산
+    total_arr = wp * s_p_arr + wr * s_r_arr + wd * s_d_arr
+
+    # 4-3. 결과 딕셔너리 구성 (공개 API 형식 유지, Python float로 변환)
+    log_details = logger.isEnabledFor(logging.INFO)
+    for robot_id, specs, s_total, s_p, s_r, s_d, ratio, log_penalty, mode_idx in zip(
+        robot_ids, specs_list, total_arr.tolist(), s_p_arr.tolist(), s_r_arr.tolist(),
+        s_d_arr.tolist(), ratio_arr.tolist(), log_penalty_arr.tolist(), mode_arr.tolist()
+    ):
+        mode = _PAYLOAD_MODES[mode_idx]
+        p_details = PayloadDetails(ratio, s_p if mode == 'gaussian' else 0, log_penalty, mode)
 
         all_scores[robot_id] = {
             'total': s_total,
             'payload_score': s_p,
             'reach_score': s_r,
             'dof_score': s_d,
-            'specs': specs,
+            'specs': copy.deepcopy(specs),  # 캐시된 DB 항목 보호 (호출자가 수정해도 안전)
             'payload_details': p_details
         }
 
         # 상세 로깅 (가우시안/로그스케일 모드 표시)
+        # INFO가 꺼져 있으면 로봇별 문자열 포맷팅 자체를 건너뜀
+        if not log_details:
+            continue
+
         p_info = f"P: {s_p:.3f}"
-        mode = p_details.get('mode', 'unknown')
 
         if mode == 'log_scale':
             # 로그 스케일 모드 (과스펙)
-            p_info += f" (log_scale, ratio={p_details['ratio']:.1f}x)"
+            p_info += f" (log_scale, ratio={ratio:.1f}x)"
         elif mode == 'gaussian':
             # 가우시안 모드 (적정 스펙)
-            p_info += f" (gaussian, ratio={p_details['ratio']:.1f}x)"
-        elif mode == 'insufficient':
-            p_info += f" (insufficient)"
+            p_info += f" (gaussian, ratio={ratio:.1f}x)"
         else:
-            p_info += f" (ratio={p_details.get('ratio', 0):.1f}x)"
+            p_info += f" (insufficient)"
 
         logger.info(
             f"  로봇: {robot_id:<15} | "
@@ -391,26 +545,31 @@ def select_best_robot(
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    # 점수가 0인 로봇은 제외
-    valid_robots = {k: v for k, v in all_scores.items() if v['total'] > 0}
+    # 점수가 0인 로봇은 제외 (argmax는 동점 시 DB 순서상 첫 로봇 선택 - 기존 max()와 동일)
+    best_idx = int(np.argmax(total_arr))
 
-    if not valid_robots:
+    if total_arr[best_idx] <= 0:
         error_msg = "Error: 요구사항을 만족하는 로봇이 없습니다. 모든 로봇의 점수가 0입니다."
         logger.error(error_msg)
         raise ValueError(error_msg)
 
-    best_robot_id = max(valid_robots, key=lambda k: valid_robots[k]['total'])
-    best_score = valid_robots[best_robot_id]['total']
+    best_robot_id = robot_ids[best_idx]
+    best_score = all_scores[best_robot_id]['total']
 
     logger.info("="*80)
     logger.info(f"[RobotSelector] ✓ 선택 완료")
     logger.info(f"최적 로봇: {best_robot_id} (점수: {best_score:.4f})")
     logger.info("="*80)
 
+    if cache_key is not None:
+        if len(_SELECT_CACHE) >= SELECT_CACHE_SIZE:
+            del _SELECT_CACHE[next(iter(_SELECT_CACHE))]
+        _SELECT_CACHE[cache_key] = (best_robot_id, best_score, all_scores)
+
     return best_robot_id, best_score, all_scores
 
 
-# --- 4. 유틸리티 함수 ---
+# --- 5. 유틸리티 함수 ---
 
 def print_selection_report(best_robot_id: str, all_scores: Dict):
     """
@@ -420,10 +579,6 @@ def print_selection_report(best_robot_id: str, all_scores: Dict):
         best_robot_id: 선택된 로봇 ID
         all_scores: 모든 로봇의 점수 딕셔너리
     """
-    print("\n" + "="*80)
-    print("ROBOT SELECTION REPORT")
-    print("="*80)
-
     # 점수 순으로 정렬
     sorted_robots = sorted(
         all_scores.items(),
@@ -431,12 +586,20 @@ def print_selection_report(best_robot_id: str, all_scores: Dict):
         reverse=True
     )
 
-    print(f"\n{'Rank':<6} {'Robot ID':<20} {'Total Score':<15} {'Payload':<12} {'Reach':<12} {'DoF':<12}")
-    print("-"*80)
+    # 보고서 전체를 한 번에 만들어 출력 (행마다 print 호출하지 않음)
+    lines = [
+        "",
+        "=" * 80,
+        "ROBOT SELECTION REPORT",
+        "=" * 80,
+        "",
+        f"{'Rank':<6} {'Robot ID':<20} {'Total Score':<15} {'Payload':<12} {'Reach':<12} {'DoF':<12}",
+        "-" * 80,
+    ]
 
     for rank, (robot_id, scores) in enumerate(sorted_robots, 1):
         marker = " [SELECTED]" if robot_id == best_robot_id else ""
-        print(
+        lines.append(
             f"{rank:<6} "
             f"{robot_id:<20} "
             f"{scores['total']:.4f}{marker:<15} "
@@ -445,23 +608,29 @@ def print_selection_report(best_robot_id: str, all_scores: Dict):
             f"{scores['dof_score']:.1f}"
         )
 
-    print("="*80)
+    lines.append("=" * 80)
 
     # 선택된 로봇 상세 정보
     best_specs = all_scores[best_robot_id]['specs']
-    print(f"\nSELECTED ROBOT DETAILS:")
-    print(f"  Robot ID: {best_robot_id}")
-    print(f"  Manufacturer: {best_specs.get('manufacturer', 'N/A')}")
-    print(f"  Payload: {best_specs['payload']} kg")
-    print(f"  Reach: {best_specs['reach']} m")
-    print(f"  DoF: {best_specs['dof']}")
-    print(f"  Max Velocity: {best_specs.get('max_velocity', 'N/A')} rad/s")
-    print(f"  Max Acceleration: {best_specs.get('max_acceleration', 'N/A')} rad/s^2")
-    print(f"  Description: {best_specs.get('description', 'N/A')}")
-    print("="*80 + "\n")
-
-
-# --- 5. 실행 예제 ---
+    lines += [
+        "",
+        "SELECTED ROBOT DETAILS:",
+        f"  Robot ID: {best_robot_id}",
+        f"  Manufacturer: {best_specs.get('manufacturer', 'N/A')}",
+        f"  Payload: {best_specs['payload']} kg",
+        f"  Reach: {best_specs['reach']} m",
+        f"  DoF: {best_specs['dof']}",
+        f"  Max Velocity: {best_specs.get('max_velocity', 'N/A')} rad/s",
+        f"  Max Acceleration: {best_specs.get('max_acceleration', 'N/A')} rad/s^2",
+        f"  Description: {best_specs.get('description', 'N/A')}",
+        "=" * 80,
+        "",
+        "",
+    ]
+    sys.stdout.write("\n".join(lines))
+
+
+# --- 6. 실행 예제 ---
 
 if __name__ == "__main__":
     # 로깅 설정
@@ -474,6 +643,69 @@ if __name__ == "__main__":
     print("ROBOT SELECTOR TEST")
     print("="*80 + "\n")
 
+    # 1. 벡터화 점수 함수가 스칼라 점수 함수와 같은 결과를 내는지 확인
+    #    (경계값 포함: 요구량과 동일, THRESHOLD 배, 부족한 경우)
+    for required in (0.2, 1.0, 5.0, 15.0):
+        payloads = np.array([0.0, required * 0.5, required, required * ALPHA_P, required * THRESHOLD,
+                             required * THRESHOLD + 1e-9, required * 10, 3.0, 7.0, 20.0, 35.0])
+        scores, ratios, log_penalties, modes = _payload_scores(payloads, required)
+        for i, robot_payload in enumerate(payloads.tolist()):
+            expected, details = calculate_payload_score(robot_payload, required, return_details=True)
+            assert math.isclose(scores[i], expected, rel_tol=1e-12, abs_tol=1e-15), \
+                f"payload score mismatch: payload={robot_payload}, required={required}"
+            assert _PAYLOAD_MODES[modes[i]] == details.mode, \
+                f"payload mode mismatch: payload={robot_payload}, required={required}"
+            assert math.isclose(ratios[i], details.ratio, rel_tol=1e-12), \
+                f"payload ratio mismatch: payload={robot_payload}, required={required}"
+            assert math.isclose(log_penalties[i], details.log_penalty, rel_tol=1e-12, abs_tol=1e-15), \
+                f"log penalty mismatch: payload={robot_payload}, required={required}"
+
+    for required in (0.5, 0.8, 1.1, 1.7):
+        reaches = np.array([0.0, required - 0.1, required, required + 1e-6, required + 0.2, 1.3, 2.0, 3.1])
+        for robot_reach, score in zip(reaches.tolist(), _reach_scores(reaches, required).tolist()):
+            assert math.isclose(score, calculate_reach_score(robot_reach, required), rel_tol=1e-12, abs_tol=1e-12), \
+                f"reach score mismatch: reach={robot_reach}, required={required}"
+
+    for required in (4, 6, 7):
+        dofs = np.array([4, 5, 6, 7, 8])
+        for robot_dof, score in zip(dofs.tolist(), _dof_scores(dofs, required).tolist()):
+            assert score == calculate_dof_score(robot_dof, required), \
+                f"dof score mismatch: dof={robot_dof}, required={required}"
+    print("[OK] Vectorized scores match scalar scorers")
+
+    # 2. 요구사항 파싱 회귀 테스트 (기대값은 줄 단위 파서 기준)
+    requirement_cases = [
+        ("", {'payload': 1.0, 'reach': 0.8, 'dof': 6}),
+        ("PAYLOAD_KG: 15.0\nREQUIRED_REACH_M: 1.1\nREQUIRED_DOF: 6\n"
+         "SPAWN MoveLinear(PosX(300,0,200,0,180,0), 50, 50, 0, 0.0, None) WITH WAIT;",
+         {'payload': 15.0, 'reach': 1.1, 'dof': 6}),
+        # SetWorkpieceWeight payload + 가장 먼 PosX로 reach 추정
+        ("SPAWN SetWorkpieceWeight(0.2, Trans(0, 0, 80, 0, 0, 0)) WITH WAIT;\n"
+         "SPAWN MoveLinear(PosX(1200, 300, 500, 0, 180, 0)) WITH WAIT;\n"
+         "SPAWN MoveLinear(PosX(400, 100, 500, 0, 180, 0)) WITH WAIT;",
+         {'payload': 0.2, 'reach': math.hypot(1200, 300) / 1000.0 * 1.1, 'dof': 6}),
+        # 명시적 PAYLOAD_KG가 앞/뒤의 SetWorkpieceWeight보다 우선
+        ("SPAWN SetWorkpieceWeight(3, Trans(0, 0, 80, 0, 0, 0)) WITH WAIT;\n// PAYLOAD_KG: 7.5\n"
+         "SPAWN SetWorkpieceWeight(9.0, Trans(0,0,0,0,0,0)) WITH WAIT;",
+         {'payload': 7.5, 'reach': 0.8, 'dof': 6}),
+        ("// PAYLOAD_KG: 4\n// REQUIRED_DOF: 7\nSPAWN MoveLinear(PosX(900, 0, 500, 0, 180, 0)) WITH WAIT;",
+         {'payload': 4.0, 'reach': 0.9 * 1.1, 'dof': 7}),
+        # 명시적 reach가 있으면 PosX 추정은 (앞/뒤 위치와 관계없이) 무시
+        ("REQUIRED_REACH_M: 0.5\nSPAWN MoveLinear(PosX(1500, 200, 500, 0, 180, 0)) WITH WAIT;",
+         {'payload': 1.0, 'reach': 0.5, 'dof': 6}),
+        ("SPAWN MoveLinear(PosX(1500, 200, 500, 0, 180, 0)) WITH WAIT;\nREQUIRED_REACH_M: 0.5",
+         {'payload': 1.0, 'reach': 0.5, 'dof': 6}),
+        # 추정 reach가 기본값보다 작으면 기본값 유지
+        ("SPAWN MoveLinear(PosX(100, 50, 500, 0, 180, 0)) WITH WAIT;",
+         {'payload': 1.0, 'reach': 0.8, 'dof': 6}),
+    ]
+    for tdl, expected in requirement_cases:
+        parsed = parse_requirements_from_tdl(tdl)
+        assert parsed.keys() == expected.keys() and parsed['dof'] == expected['dof'] and all(
+            math.isclose(parsed[key], expected[key], rel_tol=1e-12) for key in ('payload', 'reach')
+        ), f"requirements mismatch for {tdl!r}: {parsed} != {expected}"
+    print("[OK] Requirement parsing matches the expected values\n")
+
     # 가짜 TDL (v1) 내용 (테스트용)
     # PAYLOAD_KG: 15.0
     # REQUIRED_REACH_M: 1.1
@@ -8,6 +8,19 @@ import pybullet_data
 import numpy as np
 import time
 import math
+import logging
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+# PyBullet default simulation timestep
+TIME_STEP = 1. / 240.
+
+# Timesteps to let objects settle after creation / reset
+SETTLE_STEPS = 100
+
+# List-valued object info fields: stored as tuples in the static cache, returned as fresh lists
+_STATIC_LIST_KEYS = ("bounding_box", "dimensions")
 
 # Slot-specific positions to prevent robot overlap
 # When same robot type is loaded in both slots, they must be at different positions
@@ -17,13 +30,35 @@ SLOT_POSITIONS = {
 }
 
 
+def _euler_to_quat(euler):
+    """
+    Convert roll/pitch/yaw Euler angles to quaternions (same convention as
+    p.getQuaternionFromEuler), vectorized over leading dimensions.
+
+    Args:
+        euler (array-like): (..., 3) angles [roll, pitch, yaw] in radians
+
+    Returns:
+        np.ndarray: (..., 4) quaternions [x, y, z, w]
+    """
+    half = np.asarray(euler, dtype=float) * 0.5
+    cr, cp, cy = np.cos(half[..., 0]), np.cos(half[..., 1]), np.cos(half[..., 2])
+    sr, sp, sy = np.sin(half[..., 0]), np.sin(half[..., 1]), np.sin(half[..., 2])
+    return np.stack([
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+        cr * cp * cy + sr * sp * sy,
+    ], axis=-1)
+
+
 class MultiRobotEnv:
     """
     A multi-robot collaborative environment using PyBullet.
     Features two robots (UR5 and Panda) working around a central table with multiple objects.
     """
 
-    def __init__(self, gui=True, robot_config=None):
+    def __init__(self, gui=True, robot_config=None, seed=None):
         """
         Initialize the simulation environment.
 
@@ -35,13 +70,21 @@ class MultiRobotEnv:
                     'Robot_B': {robot_db entry with pybullet_config}
                 }
                 If None, uses default configuration (KUKA + Panda)
+            seed (int): Seed for reset() object randomization (None = nondeterministic)
         """
         # Connect to PyBullet
+        self.gui = gui
         if gui:
             # Use GUI_SERVER with custom resolution to ensure H.264-compatible dimensions
             # Must use even height (e.g., 1024x768, not 1024x757) for H.264 encoding
             options = "--width=1024 --height=768"
             self.client = p.connect(p.GUI, options=options)
+
+            # Hide the debug side panels (their RGB/depth/segmentation previews re-render
+            # every frame) and disable mouse picking so the scene can't be disturbed.
+            # Shadows stay on: the recorded videos render through the same OpenGL context.
+            p.configureDebugVisualizer(p.COV_ENABLE_GUI, 0)
+            p.configureDebugVisualizer(p.COV_ENABLE_MOUSE_PICKING, 0)
         else:
             self.client = p.connect(p.DIRECT)
 
@@ -58,8 +101,15 @@ class MultiRobotEnv:
         self.objects = {}
         self.robot_ids = {}
 
-        # Load environment components
+        # Random generator for reset() object randomization
+        self._rng = np.random.default_rng(seed)
+
+        # Load environment components (no GUI redraws while bodies are being added)
+        if gui:
+            p.configureDebugVisualizer(p.COV_ENABLE_RENDERING, 0)
         self._load_environment()
+        if gui:
+            p.configureDebugVisualizer(p.COV_ENABLE_RENDERING, 1)
 
         print("MultiRobotEnv initialized successfully!")
 
@@ -70,16 +120,9 @@ class MultiRobotEnv:
         Returns:
             dict: Default config with KUKA and Panda
         """
-        import json
-        import os
-
-        db_path = os.path.join(
-            os.path.dirname(__file__),
-            'robot_selection', 'data', 'robot_db.json'
-        )
-
-        with open(db_path, 'r', encoding='utf-8') as f:
-            robot_db = json.load(f)
+        # Shared cached loader (keyed by path + mtime) also used by robot selection
+        from robot_selection.robot_selector import load_robot_db
+        robot_db = load_robot_db()  # fresh copy per call
 
         return {
             'Robot_A': robot_db['kuka_iiwa14'],
@@ -95,7 +138,7 @@ class MultiRobotEnv:
         # Load table at center
         self.table_id = p.loadURDF("table/table.urdf",
                                     basePosition=[0, 0, 0],
-                                    baseOrientation=p.getQuaternionFromEuler([0, 0, 0]))
+                                    baseOrientation=[0, 0, 0, 1])
 
         # Get table dimensions for proper object placement
         self.table_height = 0.625
@@ -135,13 +178,16 @@ class MultiRobotEnv:
             # This ensures robots don't collide when same type is in both slots
             base_pos = SLOT_POSITIONS.get(slot_name, pybullet_cfg['base_position'])
             base_euler = pybullet_cfg['base_orientation']
-            base_orn = p.getQuaternionFromEuler(base_euler)
+            base_orn = _euler_to_quat(base_euler).tolist()
 
+            # Cached graphics shapes: a second slot with the same URDF reuses the
+            # already-built visual shapes instead of reloading meshes
             robot_id = p.loadURDF(
                 urdf_path,
                 basePosition=base_pos,
                 baseOrientation=base_orn,
-                useFixedBase=True
+                useFixedBase=True,
+                flags=p.URDF_ENABLE_CACHED_GRAPHICS_SHAPES
             )
 
             # Store with robot_id as key (backward compatibility)
@@ -151,14 +197,19 @@ class MultiRobotEnv:
             # Store metadata for adapter layer
             if not hasattr(self, 'robot_metadata'):
                 self.robot_metadata = {}
+            num_joints = p.getNumJoints(robot_id)  # Fixed for a loaded URDF
             self.robot_metadata[internal_key] = {
                 'slot': slot_name,
                 'config': pybullet_cfg,
                 'actual_position': base_pos,  # Track actual position used
-                'spec': robot_spec
+                'spec': robot_spec,
+                # Fixed-base robots never move: read the base pose once for get_env_state()
+                'base_pose': p.getBasePositionAndOrientation(robot_id),
+                'num_joints': num_joints,
+                'joint_idx': list(range(num_joints))
             }
 
-            print(f"  Loaded {slot_name} ({robot_spec['robot_id']}) at position {base_pos}")
+            logger.debug("  Loaded %s (%s) at position %s", slot_name, robot_spec['robot_id'], base_pos)
 
         # Initialize robot joint positions
         self._init_robot_poses()
@@ -169,11 +220,13 @@ class MultiRobotEnv:
             metadata = self.robot_metadata[robot_key]
             home_pose = metadata['config']['home_pose']
 
-            num_joints = p.getNumJoints(robot_id)
-            for i in range(min(len(home_pose), num_joints)):
-                p.resetJointState(robot_id, i, home_pose[i])
+            # One batched reset (positions + zero velocities) instead of a call per joint
+            n = min(len(home_pose), metadata['num_joints'])
+            p.resetJointStatesMultiDof(robot_id, metadata['joint_idx'][:n],
+                                       targetValues=[[q] for q in home_pose[:n]],
+                                       targetVelocities=[[0.0]] * n)
 
-            print(f"  Initialized {robot_key} to home pose")
+            logger.debug("  Initialized %s to home pose", robot_key)
 
     def _create_objects(self):
         """Create diverse objects on the table using procedural shapes."""
@@ -204,7 +257,7 @@ class MultiRobotEnv:
                                       baseCollisionShapeIndex=banana_collision,
                                       baseVisualShapeIndex=banana_visual,
                                       basePosition=banana_pos,
-                                      baseOrientation=p.getQuaternionFromEuler([math.pi/2, 0, 0.3]))
+                                      baseOrientation=_euler_to_quat([math.pi/2, 0, 0.3]).tolist())
 
         self.objects[banana_id] = {
             "obj_id": banana_id,
@@ -269,40 +322,78 @@ class MultiRobotEnv:
             "radius": 0.035
         }
 
-        # Let objects settle
-        for _ in range(100):
-            p.stepSimulation()
+        # Let objects settle (sub-stepped inside Bullet, single Python call)
+        self.step_many(SETTLE_STEPS)
+
+        # Remember settled poses so the scene can be restored without reloading
+        self.initial_object_poses = {
+            obj_id: p.getBasePositionAndOrientation(obj_id)
+            for obj_id in self.objects
+        }
+
+        # Static per-object info (metadata + bounding box), built once for get_object_info()
+        self._static_info = {
+            obj_id: self._build_static_info(meta)
+            for obj_id, meta in self.objects.items()
+        }
+
+        # Object IDs in registry order (row order of get_object_poses())
+        self.object_ids = np.fromiter(self.objects, dtype=np.int32, count=len(self.objects))
+        self.object_ids.setflags(write=False)
+
+    def restore_initial_state(self):
+        """
+        Restore the scene to its state right after initialization.
+        Unlike reset(), object poses are not randomized: robots return to their
+        home poses (joint states and motor targets) and objects to their settled
+        initial poses with zero velocity.
+        """
+        self._init_robot_poses()
+
+        # Hold robots at home pose (clears motor targets left by previous tasks)
+        for robot_key, robot_id in self.robot_ids.items():
+            metadata = self.robot_metadata[robot_key]
+            home_pose = metadata['config']['home_pose']
+            n = min(len(home_pose), metadata['num_joints'])
+            p.setJointMotorControlArray(robot_id, metadata['joint_idx'][:n], p.POSITION_CONTROL,
+                                        targetPositions=list(home_pose[:n]))
+
+        for obj_id, (pos, orn) in self.initial_object_poses.items():
+            p.resetBasePositionAndOrientation(obj_id, pos, orn)
+            p.resetBaseVelocity(obj_id, [0, 0, 0], [0, 0, 0])
+
+        print("Environment restored to initial state!")
 
-    def reset(self):
+    def reset(self, settle_steps=SETTLE_STEPS, seed=None):
         """
         Reset the environment.
         Resets robots to home poses and randomizes object positions slightly on the table.
+
+        Args:
+            settle_steps (int): Timesteps to simulate afterwards so objects come to rest
+                                (0 skips settling, e.g. when the caller steps anyway)
+            seed (int): If given, reseed the randomization so this reset (and the
+                        ones after it) are reproducible
         """
+        if seed is not None:
+            self._rng = np.random.default_rng(seed)
+
         # Reset robot poses
         self._init_robot_poses()
 
-        # Randomize object positions slightly
-        for obj_id in self.objects.keys():
-            # Get current position
-            pos, orn = p.getBasePositionAndOrientation(obj_id)
-
-            # Add small random offset while keeping objects on table
-            new_x = np.random.uniform(-0.2, 0.2)
-            new_y = np.random.uniform(-0.2, 0.2)
-            new_z = self.table_surface_height + 0.05
+        # Randomize object positions slightly (one RNG draw for all objects)
+        n = len(self.objects)
+        z = self.table_surface_height + 0.05
+        positions = self._rng.uniform([-0.2, -0.2, z], [0.2, 0.2, z], size=(n, 3))
 
-            # Random orientation
-            new_orn = p.getQuaternionFromEuler([
-                np.random.uniform(0, 2*math.pi),
-                np.random.uniform(0, 2*math.pi),
-                np.random.uniform(0, 2*math.pi)
-            ])
+        # Random orientation (whole batch converted to quaternions at once)
+        quats = _euler_to_quat(self._rng.uniform(0, 2*math.pi, size=(n, 3)))
 
-            p.resetBasePositionAndOrientation(obj_id, [new_x, new_y, new_z], new_orn)
+        for obj_id, pos, orn in zip(self.objects, positions.tolist(), quats.tolist()):
+            p.resetBasePositionAndOrientation(obj_id, pos, orn)
 
         # Let objects settle after reset
-        for _ in range(100):
-            p.stepSimulation()
+        self.step_many(settle_steps)
 
         print("Environment reset complete!")
 
@@ -310,6 +401,32 @@ class MultiRobotEnv:
         """Step the simulation forward by one timestep."""
         p.stepSimulation()
 
+    def step_many(self, n):
+        """
+        Advance the simulation by n timesteps in a single stepSimulation call.
+
+        The engine runs n internal substeps of TIME_STEP each, so the physics
+        match n calls to step() without n Python round trips. Use this only
+        when no per-step work (e.g. frame capture) is needed in between.
+
+        Bullet derives the substep count as int(dt / (dt / n)), which rounds
+        down to n - 1 for some n (e.g. 31, 62, 123); those fall back to n
+        separate steps so no substep is lost.
+
+        Args:
+            n (int): Number of TIME_STEP timesteps to advance
+        """
+        dt = TIME_STEP * n
+        if n <= 1 or int(dt / (dt / n)) != n:
+            for _ in range(n):
+                p.stepSimulation()
+            return
+        p.setPhysicsEngineParameter(fixedTimeStep=dt, numSubSteps=n)
+        try:
+            p.stepSimulation()
+        finally:
+            p.setPhysicsEngineParameter(fixedTimeStep=TIME_STEP, numSubSteps=0)
+
     def get_object_info(self, obj_id):
         """
         Get detailed information about a specific object.
@@ -320,27 +437,73 @@ class MultiRobotEnv:
         Returns:
             dict: Object metadata including position, orientation, and properties
         """
-        if obj_id not in self.objects:
+        static_info = self._static_info.get(obj_id)
+        if static_info is None:
             return None
 
         # Get current position and orientation
         pos, orn = p.getBasePositionAndOrientation(obj_id)
 
-        # Get base metadata
-        obj_info = self.objects[obj_id].copy()
+        # Static metadata + current state
+        return self._with_pose(static_info, list(pos), list(orn))
+
+    @staticmethod
+    def _build_static_info(meta):
+        """
+        Build the read-only static part of an object's info (metadata + bounding box).
+
+        Args:
+            meta (dict): Object metadata from self.objects
 
-        # Update with current state
-        obj_info["position"] = list(pos)
-        obj_info["orientation"] = list(orn)
+        Returns:
+            MappingProxyType: Metadata with "bounding_box" computed from the shape
+                              (list-valued fields stored as tuples so the cache can't be mutated)
+        """
+        info = dict(meta)
 
         # Calculate bounding box based on shape
-        if obj_info["shape"] == "sphere":
-            radius = obj_info.get("radius", 0.04)
-            obj_info["bounding_box"] = [radius*2, radius*2, radius*2]
-        elif obj_info["shape"] in ["cylinder", "box"]:
-            obj_info["bounding_box"] = obj_info.get("dimensions", [0.1, 0.1, 0.1])
+        if info["shape"] == "sphere":
+            radius = info.get("radius", 0.04)
+            info["bounding_box"] = (radius*2, radius*2, radius*2)
+        elif info["shape"] in ["cylinder", "box"]:
+            info["bounding_box"] = tuple(info.get("dimensions", (0.1, 0.1, 0.1)))
+
+        for key in _STATIC_LIST_KEYS:
+            if key in info:
+                info[key] = tuple(info[key])
+
+        return MappingProxyType(info)
+
+    @staticmethod
+    def _with_pose(static_info, position, orientation):
+        """
+        Combine static info with a current pose into a fresh object info dict
+        (list-valued fields are copied back to new lists for every caller).
+        """
+        info = {**static_info, "position": position, "orientation": orientation}
+        for key in _STATIC_LIST_KEYS:
+            if key in info:
+                info[key] = list(info[key])
+        return info
 
-        return obj_info
+    def get_object_poses(self):
+        """
+        Get current poses of all objects as parallel arrays.
+
+        Unlike get_all_objects_info(), no per-object dicts are built. Each call
+        returns freshly allocated pose arrays; object_ids is shared and read-only.
+
+        Returns:
+            tuple: (object_ids (N,) int32, positions (N, 3), orientations (N, 4) as xyzw)
+                   Row i of each array belongs to object_ids[i].
+        """
+        num_objects = len(self.object_ids)
+        positions = np.empty((num_objects, 3))
+        orientations = np.empty((num_objects, 4))
+        for i, obj_id in enumerate(self.object_ids.tolist()):
+            positions[i], orientations[i] = p.getBasePositionAndOrientation(obj_id)
+
+        return self.object_ids, positions, orientations
 
     def get_all_objects_info(self):
         """
@@ -349,14 +512,13 @@ class MultiRobotEnv:
         Returns:
             list: List of dictionaries containing metadata for each object
         """
-        all_info = []
+        object_ids, positions, orientations = self.get_object_poses()
 
-        for obj_id in self.objects.keys():
-            info = self.get_object_info(obj_id)
-            if info:
-                all_info.append(info)
-
-        return all_info
+        # Static metadata + current state (one pose query per object, as in get_object_info())
+        return [
+            self._with_pose(self._static_info[obj_id], pos, orn)
+            for obj_id, pos, orn in zip(object_ids.tolist(), positions.tolist(), orientations.tolist())
+        ]
 
     def get_env_state(self):
         """
@@ -370,14 +532,14 @@ class MultiRobotEnv:
             "robots": {}
         }
 
-        # Add robot information
+        # Add robot information (base pose cached at load time, robots use a fixed base)
         for robot_name, robot_id in self.robot_ids.items():
-            pos, orn = p.getBasePositionAndOrientation(robot_id)
+            pos, orn = self.robot_metadata[robot_name]['base_pose']
             state["robots"][robot_name] = {
                 "id": robot_id,
                 "position": list(pos),
                 "orientation": list(orn),
-                "num_joints": p.getNumJoints(robot_id)
+                "num_joints": self.robot_metadata[robot_name]['num_joints']
             }
 
         return state
@@ -406,14 +568,12 @@ if __name__ == "__main__":
     print("\nRunning simulation for 1000 steps...")
     print("(The GUI window should show two robots and objects on a table)")
 
-    # Run simulation
-    for i in range(1000):
-        env.step()
-        time.sleep(1./240.)  # Real-time visualization at 240Hz
-
-        # Print object info every 200 steps
-        if (i + 1) % 200 == 0:
-            print(f"\nStep {i + 1}/1000")
+    # Run simulation: in GUI mode Bullet steps in real time on its own thread,
+    # so the main thread only waits (no per-step Python call + sleep)
+    p.setRealTimeSimulation(1)
+    for i in range(200, 1001, 200):
+        time.sleep(200 * TIME_STEP)
+        print(f"\nStep {i}/1000")
 
     print("\n" + "=" * 60)
     print("Simulation Complete - Object Metadata:")
@@ -450,11 +610,10 @@ if __name__ == "__main__":
     print("Test Complete! Press Ctrl+C or close GUI to exit.")
     print("=" * 60)
 
-    # Keep simulation running until user closes
+    # Keep simulation running until user closes (still real-time stepping)
     try:
         while True:
-            env.step()
-            time.sleep(1./240.)
+            time.sleep(1.)
     except KeyboardInterrupt:
         print("\nShutting down...")
         env.close()
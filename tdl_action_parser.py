@@ -14,7 +14,67 @@ Date: 2025-12-02
 """
 
 import re
-from typing import List, Dict, Optional
+import math
+import logging
+from dataclasses import dataclass
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np  # imported lazily in parse_tdl_to_action_batch (the parser itself needs no numpy)
+
+logger = logging.getLogger(__name__)
+
+# Precompiled patterns (compiled once at import, reused on every parse)
+# GOAL Execute_Process() {   (block body is found by brace matching, see _extract_execute_process_block)
+_EXECUTE_HEADER_RE = re.compile(r'GOAL\s+Execute_Process\s*\(\s*\)\s*\{')
+_BRACE_RE = re.compile(r'[{}]')
+# SetWorkpieceWeight(0.2, ...)
+_WEIGHT_RE = re.compile(r'SetWorkpieceWeight\s*\(\s*([\d.]+)')
+# Fuzzy weight match tolerance (kg) and quantization step for the weight index (centigrams)
+WEIGHT_TOLERANCE = 0.01
+_WEIGHT_QUANTUM = 100
+
+# Execute block tokens in source order: SetWorkpieceWeight(0.2, ...) | SetDigitalOutput(0, 1|0)
+_TOKEN_RE = re.compile(
+    r'SetWorkpieceWeight\s*\(\s*(?P<weight>[\d.]+)'
+    r'|SetDigitalOutput\s*\(\s*\d+\s*,\s*(?P<gripper>[01])\s*\)'
+)
+
+# Action kind codes used by ActionBatch.kind
+ACTION_KINDS = ('pick', 'place')
+
+
+@dataclass
+class ActionBatch:
+    """
+    Parsed action sequence in column (SoA) layout.
+
+    Attributes:
+        kind (np.ndarray): uint8[N], index into ACTION_KINDS (0 = pick, 1 = place)
+        object_id (np.ndarray): int32[N], index into object_names
+        weight (np.ndarray): float64[N], object weight (kg)
+        object_names (List[str]): Distinct object names in order of first appearance
+    """
+    kind: 'np.ndarray'
+    object_id: 'np.ndarray'
+    weight: 'np.ndarray'
+    object_names: List[str]
+
+    def __len__(self) -> int:
+        return len(self.kind)
+
+    def to_dicts(self) -> List[Dict]:
+        """
+        Materialize the legacy list-of-dicts format (same as parse_tdl_to_actions()).
+
+        Returns:
+            List[Dict]: [{'action': 'pick', 'object': 'apple', 'weight': 0.2}, ...]
+        """
+        names = self.object_names
+        return [
+            {'action': ACTION_KINDS[kind], 'object': names[obj_id], 'weight': weight}
+            for kind, obj_id, weight in zip(self.kind.tolist(), self.object_id.tolist(), self.weight.tolist())
+        ]
 
 
 class TDLActionParser:
@@ -23,6 +83,7 @@ class TDLActionParser:
 
     Attributes:
         weight_to_object (dict): Mapping from object weight (kg) to object name
+            (use add_object_weight_mapping() to extend it so the lookup index stays in sync)
         gripper_state (str): Tracks gripper state during parsing ('open' or 'closed')
         current_object (str): Tracks currently targeted object
     """
@@ -43,6 +104,9 @@ class TDLActionParser:
             0.15: 'cup',
             0.3: 'bottle'
         }
+        self._weight_index = self._build_weight_index()
+        # Bumped on every mapping change so callers caching parse results can invalidate them
+        self.mapping_version = 0
 
     def parse_tdl_to_actions(self, tdl_content: str) -> List[Dict]:
         """
@@ -67,64 +131,92 @@ class TDLActionParser:
             4. Detect pick actions (gripper close after open)
             5. Detect place actions (gripper open after close)
         """
+        return [
+            {'action': action, 'object': obj_name, 'weight': weight}
+            for action, obj_name, weight in self._scan_actions(tdl_content)
+        ]
+
+    def parse_tdl_to_action_batch(self, tdl_content: str) -> ActionBatch:
+        """
+        Parse TDL content into an ActionBatch (column arrays instead of one dict per action).
+
+        Args:
+            tdl_content (str): Complete TDL file content
+
+        Returns:
+            ActionBatch: Same actions as parse_tdl_to_actions(), in SoA layout
+        """
+        import numpy as np
+
+        events = self._scan_actions(tdl_content)
+        n = len(events)
+        name_to_id = {}
+
+        kind = np.fromiter((ACTION_KINDS.index(action) for action, _, _ in events), dtype=np.uint8, count=n)
+        object_id = np.fromiter(
+            (name_to_id.setdefault(obj_name, len(name_to_id)) for _, obj_name, _ in events),
+            dtype=np.int32, count=n
+        )
+        weight = np.fromiter((w for _, _, w in events), dtype=np.float64, count=n)
+
+        return ActionBatch(kind, object_id, weight, list(name_to_id))
+
+    def _scan_actions(self, tdl_content: str) -> List[Tuple[str, str, float]]:
+        """
+        Run the pick/place state machine over the TDL (shared by both parse methods).
+
+        Args:
+            tdl_content (str): Complete TDL file content
+
+        Returns:
+            List[Tuple[str, str, float]]: (action, object_name, weight) in execution order
+        """
         actions = []
         gripper_state = 'open'  # Initial state: gripper open
         current_object = None
         current_weight = None
 
-        # First, scan entire TDL to find first workpiece weight (usually in Initialize_Process)
-        all_lines = tdl_content.split('\n')
-        for line in all_lines:
-            if 'SetWorkpieceWeight' in line:
-                weight = self._extract_weight(line)
-                if weight is not None:
-                    current_weight = weight
-                    current_object = self._extract_object_from_weight(weight)
-                    print(f"[TDL Parser] Initial object found: {current_object} (weight: {weight} kg)")
-                    break  # Use first weight as default
+        # First, find first workpiece weight in entire TDL (usually in Initialize_Process)
+        # Single regex scan over the content instead of splitting every line
+        for match in _WEIGHT_RE.finditer(tdl_content):
+            weight = self._weight_from_match(match)
+            if weight is not None:
+                current_weight = weight
+                current_object = self._extract_object_from_weight(weight)
+                logger.debug("[TDL Parser] Initial object found: %s (weight: %s kg)", current_object, weight)
+                break  # Use first weight as default
 
         # Extract Execute_Process() block for action parsing
         execute_block = self._extract_execute_process_block(tdl_content)
         if not execute_block:
-            print("[TDL Parser] Warning: No Execute_Process() block found")
+            logger.warning("[TDL Parser] No Execute_Process() block found")
             return actions
 
-        # Parse line by line
-        lines = execute_block.split('\n')
-        for line in lines:
-            line = line.strip()
+        # Walk weight/gripper tokens in source order (single regex pass, no line splitting)
+        for match in _TOKEN_RE.finditer(execute_block):
 
             # Detect SetWorkpieceWeight() → update object
-            if 'SetWorkpieceWeight' in line:
-                weight = self._extract_weight(line)
+            if match.lastgroup == 'weight':
+                weight = self._weight_from_match(match)
                 if weight is not None:
                     current_weight = weight
                     current_object = self._extract_object_from_weight(weight)
-                    print(f"[TDL Parser] Object updated: {current_object} (weight: {weight} kg)")
+                    logger.debug("[TDL Parser] Object updated: %s (weight: %s kg)", current_object, weight)
 
             # Detect SetDigitalOutput(*, 1) → gripper close → pick action
-            if 'SetDigitalOutput' in line and ', 1)' in line:
+            elif match.group('gripper') == '1':
                 if gripper_state == 'open' and current_object:
-                    actions.append({
-                        'action': 'pick',
-                        'object': current_object,
-                        'weight': current_weight
-                    })
+                    actions.append(('pick', current_object, current_weight))
                     gripper_state = 'closed'
-                    print(f"[TDL Parser] Action #{len(actions)}: pick {current_object}")
+                    logger.debug("[TDL Parser] Action #%d: pick %s", len(actions), current_object)
 
             # Detect SetDigitalOutput(*, 0) → gripper open → place action (if after pick)
-            if 'SetDigitalOutput' in line and ', 0)' in line:
-                if gripper_state == 'closed' and current_object:
-                    actions.append({
-                        'action': 'place',
-                        'object': current_object,
-                        'weight': current_weight
-                    })
-                    gripper_state = 'open'
-                    print(f"[TDL Parser] Action #{len(actions)}: place {current_object}")
-
-        print(f"[TDL Parser] Total actions extracted: {len(actions)}")
+            elif gripper_state == 'closed' and current_object:
+                actions.append(('place', current_object, current_weight))
+                gripper_state = 'open'
+                logger.debug("[TDL Parser] Action #%d: place %s", len(actions), current_object)
+
+        logger.debug("[TDL Parser] Total actions extracted: %d", len(actions))
         return actions
 
     def _extract_execute_process_block(self, tdl_content: str) -> Optional[str]:
@@ -136,41 +228,36 @@ class TDLActionParser:
 
         Returns:
             str: Content inside Execute_Process() block, or None if not found
+                 (or if its closing brace is missing)
         """
-        # Find GOAL Execute_Process() { ... }
-        pattern = r'GOAL\s+Execute_Process\s*\(\s*\)\s*\{(.*?)\n\}'
-        match = re.search(pattern, tdl_content, re.DOTALL)
-
-        if match:
-            return match.group(1)
-        else:
+        # Find GOAL Execute_Process() {
+        header = _EXECUTE_HEADER_RE.search(tdl_content)
+        if not header:
             return None
 
-    def _extract_weight(self, line: str) -> Optional[float]:
+        # Single forward scan over braces only, tracking nesting depth until the block closes
+        start = header.end()
+        depth = 1
+        for brace in _BRACE_RE.finditer(tdl_content, start):
+            depth += 1 if brace.group() == '{' else -1
+            if depth == 0:
+                return tdl_content[start:brace.start()]
+        return None
+
+    def _weight_from_match(self, match: re.Match) -> Optional[float]:
         """
-        Extract weight value from SetWorkpieceWeight() command.
+        Convert a _WEIGHT_RE / _TOKEN_RE weight match to a weight value.
 
         Args:
-            line (str): TDL line containing SetWorkpieceWeight command
+            match (re.Match): Match object whose group 1 is the weight literal
 
         Returns:
-            float: Weight in kg, or None if parsing fails
-
-        Example:
-            Input: "SPAWN SetWorkpieceWeight(0.2, Trans(0, 0, 80, 0, 0, 0)) WITH WAIT;"
-            Output: 0.2
-        """
-        # Pattern: SetWorkpieceWeight(0.2, ...)
-        pattern = r'SetWorkpieceWeight\s*\(\s*([\d.]+)'
-        match = re.search(pattern, line)
-
-        if match:
-            try:
-                weight = float(match.group(1))
-                return weight
-            except ValueError:
-                return None
-        return None
+            float: Weight in kg, or None if the captured number is malformed (e.g. "0.2.1")
+        """
+        try:
+            return float(match.group(1))
+        except ValueError:
+            return None
 
     def _extract_object_from_weight(self, weight: float) -> str:
         """
@@ -187,12 +274,20 @@ class TDLActionParser:
             return self.weight_to_object[weight]
 
         # Fuzzy match (±0.01 kg tolerance for floating point errors)
-        for known_weight, obj_name in self.weight_to_object.items():
-            if abs(weight - known_weight) < 0.01:
-                return obj_name
+        # Buckets are floored, so a known weight within tolerance always lies in the same or an
+        # adjacent centigram bucket; among all candidates the earliest mapping in weight_to_object
+        # order wins
+        key = math.floor(weight * _WEIGHT_QUANTUM)
+        best = None
+        for bucket in (key - 1, key, key + 1):
+            for order, known_weight, obj_name in self._weight_index.get(bucket, ()):
+                if abs(weight - known_weight) < WEIGHT_TOLERANCE and (best is None or order < best[0]):
+                    best = (order, obj_name)
+        if best is not None:
+            return best[1]
 
         # Unknown object
-        print(f"[TDL Parser] Warning: Unknown object weight {weight} kg")
+        logger.warning("[TDL Parser] Unknown object weight %s kg", weight)
         return f'unknown_object_{weight}kg'
 
     def add_object_weight_mapping(self, weight: float, object_name: str):
@@ -204,11 +299,29 @@ class TDLActionParser:
             object_name (str): Object name (e.g., 'strawberry')
         """
         self.weight_to_object[weight] = object_name
-        print(f"[TDL Parser] Added mapping: {weight} kg → {object_name}")
+        self._weight_index = self._build_weight_index()
+        self.mapping_version += 1
+        logger.info("[TDL Parser] Added mapping: %s kg → %s", weight, object_name)
+
+    def _build_weight_index(self) -> Dict[int, List[Tuple[int, float, str]]]:
+        """
+        Build the quantized lookup index used for fuzzy weight matching.
+
+        Returns:
+            dict: {weight in centigrams: [(order, weight, object_name), ...]} where order is
+                  the mapping's position in weight_to_object (first match wins, as in a linear scan)
+        """
+        index = {}
+        for order, (known_weight, obj_name) in enumerate(self.weight_to_object.items()):
+            index.setdefault(math.floor(known_weight * _WEIGHT_QUANTUM), []).append((order, known_weight, obj_name))
+        return index
 
 
 # Unit test
 if __name__ == "__main__":
+    # Show the parser's per-action trace
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+
     # Test with sample TDL content
     sample_tdl = """
 GOAL Execute_Process()
@@ -246,3 +359,32 @@ GOAL Execute_Process()
         print("\n[FAIL] Test FAILED")
         print(f"Expected: {expected_actions}")
         print(f"Got: {actions}")
+
+    # Weight index lookup must match a linear first-match scan over weight_to_object
+    # (including mappings that share a centigram bucket, e.g. 0.204 next to 0.2)
+    def linear_lookup(mapping, weight):
+        if weight in mapping:
+            return mapping[weight]
+        for known_weight, obj_name in mapping.items():
+            if abs(weight - known_weight) < WEIGHT_TOLERANCE:
+                return obj_name
+        return f'unknown_object_{weight}kg'
+
+    logging.disable(logging.WARNING)
+    index_parser = TDLActionParser()
+    for extra_weight, extra_name in ((0.204, 'nut'), (0.065, 'bolt'), (0.29, 'lemon'), (0.405, 'bolt_m8')):
+        index_parser.add_object_weight_mapping(extra_weight, extra_name)
+    mismatches = []
+    for grams in range(700):
+        query = grams / 1000
+        expected = linear_lookup(index_parser.weight_to_object, query)
+        got = index_parser._extract_object_from_weight(query)
+        if got != expected:
+            mismatches.append((query, expected, got))
+    logging.disable(logging.NOTSET)
+
+    if not mismatches and index_parser._extract_object_from_weight(0.212) == 'nut':
+        print("[OK] Weight index lookup matches linear scan")
+    else:
+        print("[FAIL] Weight index lookup differs from linear scan")
+        print(f"Mismatches (weight, expected, got): {mismatches[:10]}")